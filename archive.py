@@ -0,0 +1,320 @@
+"""
+NovaPulse — Article Archive
+Keeps every normalised article (with its categories and AI summary) in a
+local SQLite database with a full-text index, so past windows can be
+searched and replayed into a digest without refetching anything.
+
+Usage:
+    python archive.py search "openai" --days 7
+    python archive.py replay --since 2026-10-01 --until 2026-10-02
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone, timedelta
+
+from config import ARCHIVE_FILE
+
+logger = logging.getLogger(__name__)
+
+# ─── Schema ──────────────────────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url         TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    summary     TEXT,
+    ai_summary  TEXT,
+    source      TEXT,
+    categories  TEXT,
+    published   REAL NOT NULL,
+    archived_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+
+-- AI-relevance verdicts: Gemini labels (label 0/1) and prefilter scores
+CREATE TABLE IF NOT EXISTS verdicts (
+    url         TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    label       INTEGER,
+    score       REAL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_verdicts_source ON verdicts(source);
+
+-- Running week/month tallies of each run's ranked top stories (see rollup.py)
+CREATE TABLE IF NOT EXISTS rollup_stories (
+    period      TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    source      TEXT,
+    ai_summary  TEXT,
+    runs        INTEGER NOT NULL,
+    best_rank   INTEGER NOT NULL,
+    max_cluster INTEGER NOT NULL,
+    score       REAL NOT NULL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    PRIMARY KEY (period, url)
+);
+"""
+
+# External-content FTS table kept in sync with `articles` via triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, ai_summary, content='articles', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, ai_summary)
+    VALUES (new.rowid, new.title, new.summary, new.ai_summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, ai_summary)
+    VALUES ('delete', old.rowid, old.title, old.summary, old.ai_summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, ai_summary)
+    VALUES ('delete', old.rowid, old.title, old.summary, old.ai_summary);
+    INSERT INTO articles_fts(rowid, title, summary, ai_summary)
+    VALUES (new.rowid, new.title, new.summary, new.ai_summary);
+END;
+"""
+
+
+def connect(path: str = ARCHIVE_FILE) -> sqlite3.Connection:
+    """Open the archive, creating the schema on first use."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    try:
+        conn.executescript(_FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5 — keyword queries fall back to LIKE
+        logger.warning(f"Archive full-text index unavailable: {e}")
+    return conn
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone()
+    return row is not None
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+
+_UPSERT = """
+INSERT INTO articles
+    (url, title, summary, ai_summary, source, categories, published, archived_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    title      = excluded.title,
+    summary    = excluded.summary,
+    ai_summary = COALESCE(excluded.ai_summary, articles.ai_summary),
+    source     = excluded.source,
+    categories = excluded.categories
+"""
+
+
+def archive_articles(articles: list[dict], path: str = ARCHIVE_FILE) -> int:
+    """
+    Bulk-insert one run's articles in a single transaction.
+    Articles already in the archive are updated in place; an existing
+    ai_summary is never overwritten by an article that lacks one.
+    Returns the number of rows written.
+    """
+    if not articles:
+        return 0
+
+    from classifier import classify
+
+    now = datetime.now(timezone.utc).timestamp()
+    rows = [
+        (
+            a["url"],
+            a.get("title", ""),
+            a.get("summary", ""),
+            a.get("ai_summary") or None,
+            a.get("source", ""),
+            json.dumps(a.get("categories") or classify(a)),
+            a["published"].timestamp(),
+            now,
+        )
+        for a in articles
+        if a.get("url")
+    ]
+    conn = connect(path)
+    try:
+        with conn:
+            conn.executemany(_UPSERT, rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def record_verdicts(rows: list[tuple], path: str = ARCHIVE_FILE) -> None:
+    """Append (url, text, source, label, score) relevance verdicts."""
+    if not rows:
+        return
+    now = datetime.now(timezone.utc).timestamp()
+    conn = connect(path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO verdicts (url, text, source, label, score, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*row, now) for row in rows],
+            )
+    finally:
+        conn.close()
+
+
+def labelled_verdicts(path: str = ARCHIVE_FILE) -> list[tuple[str, int]]:
+    """
+    Latest (text, label) per URL from Gemini verdicts — the training set
+    for the relevance prefilter.
+    """
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT text, label FROM verdicts WHERE label IS NOT NULL "
+            "AND rowid IN (SELECT MAX(rowid) FROM verdicts WHERE label IS NOT NULL GROUP BY url)"
+        ).fetchall()
+        return [(r["text"], r["label"]) for r in rows]
+    finally:
+        conn.close()
+
+
+# ─── Querying ────────────────────────────────────────────────────────────────
+
+def _fts_query(keyword: str) -> str:
+    """Quote every term so user input can't trip FTS5 query syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in keyword.split())
+
+
+def _row_to_article(row: sqlite3.Row) -> dict:
+    article = {
+        "title": row["title"],
+        "url": row["url"],
+        "summary": row["summary"] or "",
+        "published": datetime.fromtimestamp(row["published"], timezone.utc),
+        "source": row["source"] or "",
+        "categories": json.loads(row["categories"] or "[]"),
+    }
+    if row["ai_summary"]:
+        article["ai_summary"] = row["ai_summary"]
+    return article
+
+
+def search(
+    keyword: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    category: str | None = None,
+    limit: int | None = 50,
+    path: str = ARCHIVE_FILE,
+) -> list[dict]:
+    """
+    Time-range + keyword query over archived articles, newest first.
+    Returns article dicts in the same shape the fetcher produces.
+    """
+    conn = connect(path)
+    try:
+        clauses, params = [], []
+        sql = "SELECT a.* FROM articles a"
+        if keyword:
+            if _has_fts(conn):
+                sql += " JOIN articles_fts f ON f.rowid = a.rowid"
+                clauses.append("articles_fts MATCH ?")
+                params.append(_fts_query(keyword))
+            else:
+                like = f"%{keyword}%"
+                clauses.append("(a.title LIKE ? OR a.summary LIKE ? OR a.ai_summary LIKE ?)")
+                params.extend([like, like, like])
+        if since:
+            clauses.append("a.published >= ?")
+            params.append(since.timestamp())
+        if until:
+            clauses.append("a.published < ?")
+            params.append(until.timestamp())
+        if category:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(a.categories) WHERE value = ?)")
+            params.append(category)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY a.published DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row_to_article(r) for r in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+# ─── Replay ──────────────────────────────────────────────────────────────────
+
+def replay(
+    since: datetime,
+    until: datetime,
+    keyword: str | None = None,
+    path: str = ARCHIVE_FILE,
+) -> list[dict]:
+    """Every archived article in [since, until), ready for classify_all()."""
+    return search(keyword=keyword, since=since, until=until, limit=None, path=path)
+
+
+def replay_digest(
+    since: datetime,
+    until: datetime,
+    keyword: str | None = None,
+    path: str = ARCHIVE_FILE,
+) -> list[str]:
+    """Rebuild the category digest messages for a past window."""
+    from classifier import classify_all
+    from formatter import format_full_digest
+
+    categorised = classify_all(replay(since, until, keyword, path))
+    return format_full_digest(categorised)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def _parse_day(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the NovaPulse article archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_search = sub.add_parser("search", help="keyword search over past articles")
+    p_search.add_argument("keyword", nargs="?")
+    p_search.add_argument("--days", type=float, default=7, help="look back N days (default 7)")
+    p_search.add_argument("--category")
+    p_search.add_argument("--limit", type=int, default=50)
+
+    p_replay = sub.add_parser("replay", help="print the digest for a past window")
+    p_replay.add_argument("--since", type=_parse_day, required=True, help="YYYY-MM-DD[THH:MM]")
+    p_replay.add_argument("--until", type=_parse_day, required=True, help="YYYY-MM-DD[THH:MM]")
+    p_replay.add_argument("--keyword")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "search":
+        since = datetime.now(timezone.utc) - timedelta(days=args.days)
+        for a in search(args.keyword, since=since, category=args.category, limit=args.limit):
+            when = a["published"].strftime("%Y-%m-%d %H:%M")
+            print(f"{when}  [{', '.join(a['categories'])}]  {a['title']}")
+            print(f"                  {a['url']}")
+    else:
+        for msg in replay_digest(args.since, args.until, args.keyword):
+            print("=" * 60)
+            print(msg)
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
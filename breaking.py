@@ -0,0 +1,153 @@
+"""
+NovaPulse — Breaking-News Fast Lane
+Polls a few high-authority lab blogs (BREAKING_FEEDS) between scheduled
+digests and posts a single summarised alert as soon as a big story lands.
+
+A new lab post is scored on:
+  - AI keyword signal: distinct CATEGORIES keywords it hits (capped)
+  - cross-source coverage: how many GLOBAL_RSS_FEEDS sources are already
+    running the same story (title clustering, as in the local ranker)
+Posts scoring at least BREAKING_THRESHOLD are summarised and sent.
+
+The watcher keeps its own small state file (BREAKING_STATE_FILE, read and
+written through posted.py) rather than writing the digest's state:
+  - alerts: each alert's story URLs and article, kept for
+    ALERT_RETENTION_HOURS. news_bot treats those URLs as already posted
+    (so the next digest skips the story) and archives the alert articles.
+  - coverage: the last fetch of the coverage feeds, reused for
+    BREAKING_COVERAGE_TTL_MINUTES so frequent polls don't refetch them.
+
+Usage:
+    python breaking.py          # Poll every BREAKING_POLL_SECONDS
+    python breaking.py --once   # Single poll (for cron)
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timezone, timedelta
+
+from categories import BREAKING_FEEDS, GLOBAL_RSS_FEEDS
+from config import (
+    BREAKING_POLL_SECONDS,
+    BREAKING_WINDOW_HOURS,
+    BREAKING_THRESHOLD,
+    BREAKING_COVERAGE_TTL_MINUTES,
+)
+from posted import (
+    load_seen_urls,
+    filter_seen,
+    load_breaking_state,
+    save_breaking_state,
+    serialise_article,
+    deserialise_article,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_KEYWORD_POINTS = 4      # Keyword hits alone can't trigger an alert
+ALERT_RETENTION_HOURS = 48  # Long enough for at least one scheduled digest to pick alerts up
+
+
+# ─── Scoring ─────────────────────────────────────────────────────────────────
+
+def coverage_for(article: dict, others: list[dict]) -> list[dict]:
+    """Articles from other sources that cluster with `article` (same story)."""
+    from local_summarizer import cluster
+
+    for members in cluster([article] + others):
+        if members[0] is article:
+            return [a for a in members[1:] if a["source"] != article["source"]]
+    return []
+
+
+def score(article: dict, coverage: list[dict]) -> float:
+    from classifier import keyword_hits
+
+    keyword_points = min(len(keyword_hits(article)), MAX_KEYWORD_POINTS) * 0.5
+    sources = {a["source"] for a in coverage}
+    return 1.0 + keyword_points + 1.5 * len(sources)
+
+
+def _coverage_articles(state: dict, now: datetime) -> list[dict]:
+    """The coverage feeds' recent articles, refetched at most every BREAKING_COVERAGE_TTL_MINUTES."""
+    cached = state.get("coverage")
+    if cached and now.timestamp() - cached["fetched_at"] < BREAKING_COVERAGE_TTL_MINUTES * 60:
+        return [deserialise_article(a) for a in cached["articles"]]
+
+    from fetcher import fetch_all_rss
+
+    coverage_feeds = [f for f in GLOBAL_RSS_FEEDS if f not in BREAKING_FEEDS]
+    articles = fetch_all_rss(hours=BREAKING_WINDOW_HOURS, feeds=coverage_feeds)
+    state["coverage"] = {"fetched_at": now.timestamp(), "articles": [serialise_article(a) for a in articles]}
+    return articles
+
+
+# ─── Poll ────────────────────────────────────────────────────────────────────
+
+def poll_once() -> int:
+    """Check the lab blogs once. Returns the number of alerts sent."""
+    from fetcher import fetch_all_rss
+
+    now = datetime.now(timezone.utc)
+    state = load_breaking_state()
+    retention = (now - timedelta(hours=ALERT_RETENTION_HOURS)).timestamp()
+    state["alerts"] = [a for a in state.get("alerts", []) if a["sent_at"] >= retention]
+
+    seen = load_seen_urls() | {u for alert in state["alerts"] for u in alert["urls"]}
+    candidates = filter_seen(fetch_all_rss(hours=BREAKING_WINDOW_HOURS, feeds=BREAKING_FEEDS), seen)
+    if not candidates:
+        logger.info("No new lab posts.")
+        save_breaking_state(state)
+        return 0
+
+    # Only pay for the wider fetch when there's something to score
+    others = _coverage_articles(state, now)
+
+    from summarizer import summarize_top_stories
+    from formatter import format_breaking
+    from telegram_bot import send_message
+
+    sent = 0
+    for article in candidates:
+        coverage = coverage_for(article, others)
+        s = score(article, coverage)
+        logger.info(f"  [{s:.1f}] {article['title']} ({len(coverage)} covering)")
+        if s < BREAKING_THRESHOLD:
+            continue  # May qualify on a later poll as coverage builds; else the digest takes it
+
+        summarised = summarize_top_stories([article])
+        alert = summarised[0] if summarised else article
+        n_sources = len({a["source"] for a in coverage}) + 1
+        if not send_message(format_breaking(alert, n_sources)):
+            continue
+
+        sent += 1
+        story_urls = sorted({article["url"]} | {a["url"] for a in coverage})
+        state["alerts"].append({"sent_at": now.timestamp(), "urls": story_urls, "article": serialise_article(alert)})
+        logger.info(f"🚨 Breaking alert sent; {len(story_urls)} URLs marked as posted.")
+
+    save_breaking_state(state)
+    return sent
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="NovaPulse breaking-news watcher")
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    args = parser.parse_args(argv)
+
+    logger.info(f"⚡ NovaPulse breaking-news watcher: {len(BREAKING_FEEDS)} feeds")
+    while True:
+        try:
+            poll_once()
+        except Exception as e:
+            logger.error(f"Breaking-news poll failed: {e}")
+        if args.once:
+            return
+        time.sleep(BREAKING_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
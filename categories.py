@@ -20,7 +20,6 @@ CATEGORIES = {
         ],
         "rss_feeds": [
             "https://techcrunch.com/category/artificial-intelligence/feed/",
-            "https://venturebeat.com/category/ai/feed/",
         ],
     },
 
@@ -172,6 +171,14 @@ GLOBAL_RSS_FEEDS = [
     "https://the-decoder.com/feed/",
 ]
 
+# ─── Breaking-News Sources ──────────────────────────────────────────────────
+# High-authority lab blogs polled by breaking.py between scheduled digests
+BREAKING_FEEDS = [
+    "https://openai.com/blog/rss.xml",
+    "https://deepmind.google/blog/rss.xml",
+    "https://www.anthropic.com/rss",
+]
+
 # Category display order for messages
 CATEGORY_ORDER = [
     "business", "developer_tools", "research", "products",
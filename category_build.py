@@ -0,0 +1,244 @@
+"""
+NovaPulse — Category Build
+Validates categories.py and compiles it into a small versioned artifact
+(CATEGORY_ARTIFACT_FILE) that the classifier and fetcher load at startup:
+
+  - keyword index: lower-cased keyword → the category keys that list it.
+    Keywords match as whole words with their punctuation intact, so
+    "fine-tuning" doesn't match "fine tuning" and "state of the art"
+    doesn't match "state-of-the-art" (as with the old word-boundary regexes).
+  - the deduplicated default feed list (GLOBAL_RSS_FEEDS + category feeds)
+
+The artifact is marshalled and stamped with a hash of categories.py, so a
+run only rebuilds it after categories.py changes — no regex compilation
+at import time, however long the keyword lists get.
+
+Validation errors (the build refuses to write the artifact):
+  - CATEGORY_ORDER naming unknown categories or leaving one out
+  - a category missing a required field, or with no keywords
+  - a keyword listed twice in one category, or not starting and ending
+    with a letter or digit
+  - the same feed listed twice in one list (ignoring scheme, www, trailing /)
+Warnings (reported, not fatal unless --strict):
+  - a keyword shared by several categories
+  - several feeds on the same host (often one feed under two paths)
+
+Usage:
+    python category_build.py            # Validate + (re)build the artifact
+    python category_build.py --check    # Validate only; exit 1 on errors
+    python category_build.py --strict   # Treat warnings as errors too
+"""
+
+import argparse
+import hashlib
+import logging
+import marshal
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from config import CATEGORY_ARTIFACT_FILE
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1  # Bump when the artifact layout changes
+REQUIRED_FIELDS = ("emoji", "title", "keywords")
+_SOURCE = Path(__file__).with_name("categories.py")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+# ─── Normalisation ───────────────────────────────────────────────────────────
+
+def token_spans(text: str) -> list[tuple[int, int]]:
+    """(start, end) of each word token — keyword matches start and end on these."""
+    return [m.span() for m in _TOKEN_RE.finditer(text)]
+
+
+def keyword_key(keyword: str) -> str:
+    """Lower-cased keyword, or "" if it doesn't start and end on a word token."""
+    key = keyword.lower()
+    spans = token_spans(key)
+    if not spans or spans[0][0] != 0 or spans[-1][1] != len(key):
+        return ""
+    return key
+
+
+def feed_key(url: str) -> str:
+    """Feed URL without scheme, leading www. or trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    key = host + parts.path.rstrip("/")
+    return key + (f"?{parts.query}" if parts.query else "")
+
+
+# ─── Validation ──────────────────────────────────────────────────────────────
+
+def validate(
+    categories: dict[str, dict],
+    global_feeds: list[str],
+    order: list[str],
+) -> tuple[list[str], list[str]]:
+    """Check category definitions. Returns (errors, warnings)."""
+    errors, warnings = [], []
+
+    unknown = [k for k in order if k not in categories]
+    missing = [k for k in categories if k not in order]
+    if unknown:
+        errors.append(f"CATEGORY_ORDER names unknown categories: {unknown}")
+    if missing:
+        errors.append(f"Categories missing from CATEGORY_ORDER (never shown): {missing}")
+    if len(set(order)) != len(order):
+        errors.append("CATEGORY_ORDER lists a category twice")
+
+    owners: dict[str, list[str]] = defaultdict(list)
+    for key, cat in categories.items():
+        absent = [f for f in REQUIRED_FIELDS if not cat.get(f)]
+        if absent:
+            errors.append(f"{key}: missing or empty {', '.join(absent)}")
+        seen = set()
+        for kw in cat.get("keywords", []):
+            norm = keyword_key(kw)
+            if not norm:
+                errors.append(f"{key}: keyword {kw!r} must start and end with a letter or digit")
+            elif norm in seen:
+                errors.append(f"{key}: keyword {kw!r} listed twice")
+            else:
+                seen.add(norm)
+                owners[norm].append(key)
+    for norm, keys in sorted(owners.items()):
+        if len(keys) > 1:
+            warnings.append(f"keyword {norm!r} is shared by {', '.join(keys)}")
+
+    lists = {"GLOBAL_RSS_FEEDS": global_feeds}
+    lists.update({f"{key}.rss_feeds": cat.get("rss_feeds", []) for key, cat in categories.items()})
+    by_host: dict[str, set[str]] = defaultdict(set)
+    for name, feeds in lists.items():
+        keys = [feed_key(f) for f in feeds]
+        dupes = sorted({k for k in keys if keys.count(k) > 1})
+        if dupes:
+            errors.append(f"{name}: duplicate feeds {dupes}")
+        for k in keys:
+            by_host[k.split("/", 1)[0]].add(k)
+    for host, keys in sorted(by_host.items()):
+        if len(keys) > 1:
+            warnings.append(f"{len(keys)} feeds on {host}: {sorted(keys)}")
+
+    return errors, warnings
+
+
+# ─── Compilation ─────────────────────────────────────────────────────────────
+
+def compile_index(categories: dict[str, dict]) -> dict:
+    """
+    Keyword matcher for a category set: {"categories": keys in definition
+    order, "keywords": {lower-cased keyword: category keys}, "max_ngram":
+    most word tokens in one keyword}.
+    """
+    index: dict[str, list[str]] = defaultdict(list)
+    for key, cat in categories.items():
+        for kw in cat.get("keywords", []):
+            norm = keyword_key(kw)
+            if norm and key not in index[norm]:
+                index[norm].append(key)
+    return {
+        "categories": list(categories),
+        "keywords": {k: tuple(v) for k, v in index.items()},
+        "max_ngram": max((len(token_spans(k)) for k in index), default=1),
+    }
+
+
+def compile_feeds(categories: dict[str, dict], global_feeds: list[str]) -> list[str]:
+    """Global feeds + every category feed, one URL per feed_key, first listing wins."""
+    feeds: dict[str, str] = {}
+    for url in list(global_feeds) + [u for cat in categories.values() for u in cat.get("rss_feeds", [])]:
+        feeds.setdefault(feed_key(url), url)
+    return sorted(feeds.values())
+
+
+def source_hash() -> str:
+    """Identifies one categories.py + artifact layout + marshal format."""
+    h = hashlib.sha256(_SOURCE.read_bytes())
+    h.update(f"{ARTIFACT_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    return h.hexdigest()
+
+
+def _write(artifact: dict, path: str) -> None:
+    # Write-then-rename so parallel workers never read a half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            marshal.dump(artifact, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not write category artifact {path}: {e}")
+
+
+def _compile() -> dict:
+    from categories import CATEGORIES, GLOBAL_RSS_FEEDS
+
+    return {
+        "version": ARTIFACT_VERSION,
+        "source_hash": source_hash(),
+        "index": compile_index(CATEGORIES),
+        "feeds": compile_feeds(CATEGORIES, GLOBAL_RSS_FEEDS),
+    }
+
+
+def load(path: str = CATEGORY_ARTIFACT_FILE) -> dict:
+    """
+    The compiled artifact, rebuilt first if categories.py has changed since.
+    Doesn't validate — run `python category_build.py` for that.
+    """
+    try:
+        with open(path, "rb") as f:
+            artifact = marshal.load(f)
+        if artifact.get("version") == ARTIFACT_VERSION and artifact.get("source_hash") == source_hash():
+            return artifact
+        logger.info("categories.py changed — rebuilding the category artifact.")
+    except FileNotFoundError:
+        logger.info("No category artifact yet — building it.")
+    except (OSError, ValueError, EOFError, TypeError, AttributeError) as e:
+        logger.warning(f"Unreadable category artifact, rebuilding: {e}")
+    artifact = _compile()
+    _write(artifact, path)
+    return artifact
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Validate and compile categories.py")
+    parser.add_argument("--check", action="store_true", help="validate only, don't write the artifact")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    parser.add_argument("--output", default=CATEGORY_ARTIFACT_FILE)
+    args = parser.parse_args(argv)
+
+    from categories import CATEGORIES, GLOBAL_RSS_FEEDS, CATEGORY_ORDER
+
+    errors, warnings = validate(CATEGORIES, GLOBAL_RSS_FEEDS, CATEGORY_ORDER)
+    for w in warnings:
+        print(f"⚠️  {w}")
+    for e in errors:
+        print(f"❌ {e}")
+    if errors or (args.strict and warnings):
+        sys.exit(1)
+
+    if not args.check:
+        artifact = _compile()
+        _write(artifact, args.output)
+        index = artifact["index"]
+        print(
+            f"✅ {args.output}: {len(index['keywords'])} keywords across "
+            f"{len(index['categories'])} categories, {len(artifact['feeds'])} feeds"
+        )
+    else:
+        print(f"✅ categories.py is valid ({len(warnings)} warnings)")
+
+
+if __name__ == "__main__":
+    main()
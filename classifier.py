@@ -1,37 +1,67 @@
 """
 NovaPulse — Classifier
 Assigns each article to one or more categories using keyword matching.
+Keywords are matched case-insensitively as whole words, punctuation
+included, using the keyword index compiled from categories.py by
+category_build.py.
 """
 
-import re
-from categories import CATEGORIES
+from category_build import compile_index, load, token_spans
 
-# Pre-compile keyword patterns for performance
-_PATTERNS: dict[str, re.Pattern] = {}
-for _key, _cat in CATEGORIES.items():
-    kws = [re.escape(k) for k in _cat["keywords"]]
-    _PATTERNS[_key] = re.compile(r"\b(" + "|".join(kws) + r")\b", re.IGNORECASE)
+# Loaded from the compiled artifact; rebuilt only when categories.py changes
+_INDEX: dict = load()["index"]
 
 
-def classify(article: dict) -> list[str]:
+def _hits(text: str, index: dict) -> dict[str, tuple[str, ...]]:
+    """Every keyword found in `text` → the categories that list it."""
+    keywords, max_n = index["keywords"], index["max_ngram"]
+    text = text.lower()
+    spans = token_spans(text)
+    found = {}
+    for i, (start, _) in enumerate(spans):
+        for end_span in spans[i:i + max_n]:
+            # The text between the tokens is kept, so separators must match too
+            phrase = text[start:end_span[1]]
+            cats = keywords.get(phrase)
+            if cats:
+                found[phrase] = cats
+    return found
+
+
+def classify(article: dict, index: dict | None = None) -> list[str]:
     """
     Return a list of category keys that match the article.
     Searches title + summary text.
-    Falls back to 'products' if nothing matched (catch-all).
+    Falls back to 'products' if nothing matched (catch-all), provided
+    'products' is one of the categories.
     """
+    index = index or _INDEX
     text = f"{article.get('title', '')} {article.get('summary', '')}"
-    matched = [key for key, pat in _PATTERNS.items() if pat.search(text)]
-    return matched if matched else ["products"]
+    matched = {c for cats in _hits(text, index).values() for c in cats}
+    if matched:
+        return [key for key in index["categories"] if key in matched]
+    return ["products"] if "products" in index["categories"] else []
 
 
-def classify_all(articles: list[dict]) -> dict[str, list[dict]]:
+def classify_all(
+    articles: list[dict],
+    categories: dict[str, dict] | None = None,
+) -> dict[str, list[dict]]:
     """
     Group a list of articles by category.
     Returns {category_key: [article, ...]}
     An article CAN appear in multiple categories.
+    Pass `categories` to classify against a different category set.
     """
-    buckets: dict[str, list[dict]] = {key: [] for key in CATEGORIES}
+    index = compile_index(categories) if categories is not None else _INDEX
+    buckets: dict[str, list[dict]] = {key: [] for key in index["categories"]}
     for article in articles:
-        for cat in classify(article):
+        for cat in classify(article, index):
             buckets[cat].append(article)
     return buckets
+
+
+def keyword_hits(article: dict) -> set[str]:
+    """Distinct category keywords found in the article (lower-cased)."""
+    text = f"{article.get('title', '')} {article.get('summary', '')}"
+    return set(_hits(text, _INDEX))
@@ -0,0 +1,213 @@
+"""
+NovaPulse — Command Server
+A resident bot that answers on-demand category requests from a warm
+digest cache instead of kicking off a full workflow_dispatch run.
+
+The cache holds the last window's classify_all() buckets, the Top 10
+stories and the category summaries requested so far. A background thread
+rebuilds it every DIGEST_REFRESH_MINUTES; a request only waits on the
+full pipeline when the cache is older than DIGEST_CACHE_MAX_AGE_MINUTES.
+
+The server shares its Gemini and NewsAPI keys with the scheduled digest,
+so it spends as little of either as it can. A category is summarised
+only when someone asks for it, and Gemini calls are spaced
+GEMINI_SPACING_SECONDS apart. Refreshes read RSS only, never NewsAPI.
+
+Usage:
+    python command_server.py
+
+Commands (in a private chat or group with the bot):
+    /all                 Top 10 AI stories
+    /<category>          Category digest, e.g. /research, /developer_tools
+    /categories, /help   List available commands
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from categories import CATEGORIES, CATEGORY_ORDER
+from config import DIGEST_REFRESH_MINUTES, DIGEST_CACHE_MAX_AGE_MINUTES
+from telegram_bot import get_updates, send_message, send_messages
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+POLL_TIMEOUT_SECONDS = 50
+ERROR_BACKOFF_SECONDS = 5
+GEMINI_SPACING_SECONDS = 5  # Same gap summarize_all leaves between categories
+
+
+# ─── Digest Cache ─────────────────────────────────────────────────────────────
+
+class DigestCache:
+    """Last window's buckets and summaries, swapped atomically on refresh."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()          # guards the snapshot below
+        self._refresh_lock = threading.Lock()  # one pipeline run at a time
+        self._gemini_lock = threading.Lock()   # one Gemini call at a time, spaced out
+        self._last_gemini = float("-inf")
+        self.built_at: datetime | None = None
+        self.buckets: dict[str, list[dict]] = {}
+        self.top_stories: list[dict] = []
+        self.summaries: dict[str, list[dict]] = {}
+
+    def age_minutes(self) -> float:
+        if self.built_at is None:
+            return float("inf")
+        return (datetime.now(timezone.utc) - self.built_at).total_seconds() / 60
+
+    def is_stale(self) -> bool:
+        return self.age_minutes() > DIGEST_CACHE_MAX_AGE_MINUTES
+
+    def _summarize(self, fn, *args) -> list[dict]:
+        """Run one summarizer call, at least GEMINI_SPACING_SECONDS after the last."""
+        with self._gemini_lock:
+            wait = self._last_gemini + GEMINI_SPACING_SECONDS - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return fn(*args)
+            finally:
+                self._last_gemini = time.monotonic()
+
+    def _rebuild(self) -> None:
+        """Run fetch → classify → Top 10 and publish the result. Caller holds _refresh_lock."""
+        import multiprocessing
+        from fetcher import fetch_all_rss
+        from classifier import classify_all
+        from summarizer import summarize_top_stories, reset_budget
+        from relevance import prefilter
+
+        reset_budget()
+        t0 = time.perf_counter()
+        # RSS only: NewsAPI's daily quota belongs to the scheduled digest.
+        # Spawned workers, because this runs beside the polling thread.
+        fetched = fetch_all_rss(hours=12, mp_context=multiprocessing.get_context("spawn"))
+        articles = prefilter(sorted(fetched, key=lambda a: a["published"], reverse=True))
+        buckets = classify_all(articles)
+        top_stories = self._summarize(summarize_top_stories, articles) if articles else []
+        with self._lock:
+            self.buckets = buckets
+            self.top_stories = top_stories
+            self.summaries = {}
+            self.built_at = datetime.now(timezone.utc)
+        logger.info(f"Digest cache rebuilt: {len(articles)} articles in {time.perf_counter() - t0:.1f}s")
+
+    def refresh(self) -> None:
+        """Rebuild the cache. Category summaries are left for the first request."""
+        with self._refresh_lock:
+            self._rebuild()
+
+    def ensure_fresh(self) -> None:
+        """Fall back to a synchronous pipeline run if the cache is too old."""
+        if not self.is_stale():
+            return
+        with self._refresh_lock:
+            if self.is_stale():  # a background refresh may have finished meanwhile
+                logger.info(f"Digest cache stale ({self.age_minutes():.0f} min) — running full pipeline")
+                self._rebuild()
+
+    def category(self, key: str) -> list[dict]:
+        """Summarised articles for one category, computed once per window."""
+        from summarizer import summarize_category
+
+        with self._lock:
+            if key in self.summaries:
+                return self.summaries[key]
+            built_at = self.built_at
+            # Copies: an article in several buckets gets one summary per category
+            bucket = [dict(a) for a in self.buckets.get(key, [])]
+
+        summarised = self._summarize(summarize_category, key, bucket) if bucket else []
+        with self._lock:
+            if self.built_at == built_at:
+                self.summaries[key] = summarised
+        return summarised
+
+
+def _refresh_loop(cache: DigestCache) -> None:
+    while True:
+        try:
+            cache.refresh()
+        except Exception as e:
+            logger.warning(f"Background digest refresh failed: {e}")
+        time.sleep(DIGEST_REFRESH_MINUTES * 60)
+
+
+# ─── Commands ─────────────────────────────────────────────────────────────────
+
+def _help_text() -> str:
+    lines = ["🧠 <b>BuzzWordAI</b> — on-demand AI news", "", "/all — Top 10 AI stories"]
+    for key in CATEGORY_ORDER:
+        cat = CATEGORIES[key]
+        lines.append(f"/{key} — {cat['emoji']} {cat['title']}")
+    return "\n".join(lines)
+
+
+def _parse_command(text: str) -> str | None:
+    """'/research@NovaPulseBot extra' → 'research'."""
+    if not text.startswith("/"):
+        return None
+    words = text[1:].split()
+    if not words:
+        return None  # "/" or "/ " on its own
+    return words[0].split("@")[0].lower() or None
+
+
+def handle_command(cache: DigestCache, chat_id: str, command: str) -> None:
+    from formatter import format_full_digest, format_top_stories
+
+    if command in ("all", "top"):
+        cache.ensure_fresh()
+        if not cache.top_stories:
+            send_message("🔍 <b>BuzzWordAI</b>\n\nNo AI-relevant news found right now.\nTry again later! 🧠", chat_id)
+            return
+        send_messages(format_top_stories(cache.top_stories), chat_id)
+
+    elif command in CATEGORIES:
+        cache.ensure_fresh()
+        articles = cache.category(command)
+        if not articles:
+            send_message(f"🔍 <b>BuzzWordAI</b>\n\nNo fresh AI news found for <b>{command}</b> right now.\nTry another category! 🧠", chat_id)
+            return
+        send_messages(format_full_digest({command: articles}), chat_id)
+
+    else:
+        send_message(_help_text(), chat_id)
+
+
+def main() -> None:
+    logger.info("⚡ NovaPulse command server is starting...")
+    cache = DigestCache()
+    threading.Thread(target=_refresh_loop, args=(cache,), daemon=True, name="digest-refresh").start()
+
+    offset = None
+    while True:
+        t0 = time.monotonic()
+        updates = get_updates(offset, timeout=POLL_TIMEOUT_SECONDS)
+        if not updates and time.monotonic() - t0 < 1:
+            time.sleep(ERROR_BACKOFF_SECONDS)  # poll failed fast — don't spin
+        for update in updates:
+            # Advance first, so a message that breaks parsing is skipped, not replayed forever
+            offset = update["update_id"] + 1
+            try:
+                message = update.get("message") or {}
+                command = _parse_command(message.get("text") or "")
+                if command is None:
+                    continue
+                chat_id = str(message["chat"]["id"])
+                logger.info(f"Command /{command} from chat {chat_id} (cache age {cache.age_minutes():.0f} min)")
+                handle_command(cache, chat_id, command)
+            except Exception as e:
+                logger.error(f"Failed to handle update {update.get('update_id')}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,14 @@ NovaPulse Configuration
 Load settings from environment variables (set via .env or GitHub Secrets).
 """
 import os
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
+# Only pay for python-dotenv when there is actually a .env to read —
+# CI runs get their settings from the environment directly.
+_ENV_FILE = Path(__file__).with_name(".env")
+if _ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
 
 # ─── Telegram ────────────────────────────────────────────────────────────────
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -13,15 +18,66 @@ TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID", "")  # e.g. @YourChannel
 
 # ─── NewsAPI ─────────────────────────────────────────────────────────────────
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")  # https://newsapi.org (free: 100 req/day)
+NEWSAPI_DAILY_LIMIT = int(os.getenv("NEWSAPI_DAILY_LIMIT", "100"))  # Requests per rolling 24h
+NEWSAPI_RUN_BUDGET = int(os.getenv("NEWSAPI_RUN_BUDGET", "9"))      # Max requests a single run may spend
+NEWSAPI_RESERVE = int(os.getenv("NEWSAPI_RESERVE", "20"))           # Left untouched by scheduled runs for manual ones
+NEWSAPI_PAGE_SIZE = int(os.getenv("NEWSAPI_PAGE_SIZE", "100"))  # One page per query (free tier caps at 100 results)
+NEWSAPI_CACHE_TTL_MINUTES = int(os.getenv("NEWSAPI_CACHE_TTL_MINUTES", "90"))
+NEWSAPI_STATE_FILE = "newsapi_state.json"  # Request ledger + response cache
 
 # ─── Gemini AI ───────────────────────────────────────────────────────────────
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")  # https://aistudio.google.com (free tier)
+SUMMARY_ENGINE = os.getenv("SUMMARY_ENGINE", "auto").lower()  # auto | gemini | local
+SUMMARY_TIME_BUDGET_SECONDS = float(os.getenv("SUMMARY_TIME_BUDGET_SECONDS", "240"))  # auto: local engine after this
 
 # ─── Bot Behaviour ───────────────────────────────────────────────────────────
 MAX_ARTICLES_PER_CATEGORY = int(os.getenv("MAX_ARTICLES_PER_CATEGORY", "5"))
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"   # Print instead of send
 SEND_DELAY_SECONDS = float(os.getenv("SEND_DELAY_SECONDS", "2"))  # Delay between messages
 
+# ─── Delivery ────────────────────────────────────────────────────────────────
+DELIVERY_MODE = os.getenv("DELIVERY_MODE", "post").lower()  # post | edit (update the window's digest in place)
+DIGEST_WINDOW_HOURS = float(os.getenv("DIGEST_WINDOW_HOURS", "12"))  # edit: a new digest is posted per IST window
+DIGEST_STATE_FILE = "digest_state.json"  # edit: message ids + articles of each digest kind in the current window
+
+# ─── RSS Fetching ────────────────────────────────────────────────────────────
+RSS_STREAMING = os.getenv("RSS_STREAMING", "true").lower() == "true"  # Incremental XML parse, feedparser fallback
+RSS_WORKERS = int(os.getenv("RSS_WORKERS", "8"))  # Parallel feed workers (processes); 1 = sequential
+WATERMARK_FILE = "feed_watermarks.json"  # Per-feed high-water marks for incremental fetches
+WATERMARK_MAX_LOOKBACK_HOURS = int(os.getenv("WATERMARK_MAX_LOOKBACK_HOURS", "72"))  # Never reach back further than this
+FEED_HEALTH_FILE = "feed_health.json"  # Per-feed latency / failure history
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))    # Consecutive failures before the circuit opens
+FEED_COOLDOWN_HOURS = int(os.getenv("FEED_COOLDOWN_HOURS", "12"))         # First wait before re-probing an open feed
+FEED_MAX_COOLDOWN_HOURS = int(os.getenv("FEED_MAX_COOLDOWN_HOURS", "168"))  # Back-off ceiling (1 week)
+
+# ─── Command Server ──────────────────────────────────────────────────────────
+DIGEST_REFRESH_MINUTES = int(os.getenv("DIGEST_REFRESH_MINUTES", "30"))              # Background cache rebuild interval
+DIGEST_CACHE_MAX_AGE_MINUTES = int(os.getenv("DIGEST_CACHE_MAX_AGE_MINUTES", "90"))  # Older → rebuild before replying
+
+# ─── Breaking News ───────────────────────────────────────────────────────────
+BREAKING_POLL_SECONDS = int(os.getenv("BREAKING_POLL_SECONDS", "600"))  # Watcher loop interval
+BREAKING_WINDOW_HOURS = int(os.getenv("BREAKING_WINDOW_HOURS", "6"))    # Only consider posts this recent
+BREAKING_THRESHOLD = float(os.getenv("BREAKING_THRESHOLD", "4"))        # Minimum score to alert
+BREAKING_COVERAGE_TTL_MINUTES = int(os.getenv("BREAKING_COVERAGE_TTL_MINUTES", "30"))  # Reuse the coverage fetch between polls
+BREAKING_STATE_FILE = "breaking_state.json"  # Alerts not yet seen by a digest run + cached coverage
+
+# ─── Multi-Tenant ────────────────────────────────────────────────────────────
+TENANTS_FILE = os.getenv("TENANTS_FILE", "tenants.json")  # See tenants.example.json
+TENANT_WORKERS = int(os.getenv("TENANT_WORKERS", "4"))     # Tenants processed in parallel (processes)
+TENANT_WATERMARK_FILE = "feed_watermarks.tenants.json"     # Kept apart from news_bot's WATERMARK_FILE
+
 # ─── Deduplication ───────────────────────────────────────────────────────────
 SEEN_URLS_FILE = "seen_urls.json"
 MAX_SEEN_URLS = 500  # Keep last N URLs in memory to avoid re-posting
+
+# ─── Relevance Prefilter ─────────────────────────────────────────────────────
+RELEVANCE_MODEL_FILE = "relevance_model.json"  # Trained by `python relevance.py train`
+RELEVANCE_THRESHOLD = float(os.getenv("RELEVANCE_THRESHOLD", "0.2"))  # Drop articles scoring below this
+RELEVANCE_MIN_TRAINING = int(os.getenv("RELEVANCE_MIN_TRAINING", "200"))  # Labelled verdicts needed to train
+RELEVANCE_MIN_PER_CLASS = int(os.getenv("RELEVANCE_MIN_PER_CLASS", "50"))  # ...of which at least this many keeps and SKIPs
+
+# ─── Categories ──────────────────────────────────────────────────────────────
+CATEGORY_ARTIFACT_FILE = os.getenv("CATEGORY_ARTIFACT_FILE", "categories.compiled")  # Built from categories.py by category_build.py
+
+# ─── Archive ─────────────────────────────────────────────────────────────────
+ARCHIVE_FILE = os.getenv("ARCHIVE_FILE", "archive.db")  # SQLite + FTS5 article history
@@ -0,0 +1,212 @@
+"""
+NovaPulse — Edit-in-Place Delivery
+With DELIVERY_MODE=edit, each IST window (DIGEST_WINDOW_HOURS) gets one
+digest that later runs update in place instead of reposting it:
+
+  - The first run in a window posts the digest as usual and records every
+    message's id and text hash, plus the articles it shows, in
+    DIGEST_STATE_FILE. Each kind of digest (Top 10, each category run)
+    and chat has its own entry, so interleaved runs of different kinds
+    don't overwrite each other; entries from past windows are pruned.
+  - Later runs merge their fresh articles into those, re-render, and diff
+    the result against the stored hashes message by message. Changed
+    messages are updated with editMessageText, unchanged ones are left
+    alone. New messages, e.g. a category that wasn't in the digest yet,
+    take over the old footer's slot and a new footer is posted after.
+  - A new window, or an edit Telegram rejects for good (message deleted
+    or too old), falls back to posting a fresh digest. A transient edit
+    failure is retried once; if it still fails, the old text stays up and
+    the next run tries again, so the digest is never posted twice.
+
+Dry runs print what they would post or edit but leave DIGEST_STATE_FILE
+alone, since they have no real message ids.
+
+The header (and the Top 10 dateline) keeps the time of the window's first
+post, so it isn't re-sent on every run.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import (
+    DRY_RUN,
+    DIGEST_STATE_FILE,
+    DIGEST_WINDOW_HOURS,
+    MAX_ARTICLES_PER_CATEGORY,
+    SEND_DELAY_SECONDS,
+    TELEGRAM_CHANNEL_ID,
+)
+
+logger = logging.getLogger(__name__)
+
+_IST_OFFSET_SECONDS = 5.5 * 3600
+TOP_STORIES = 10
+EDIT_RETRY_SECONDS = 5  # Wait before retrying an edit that failed transiently
+
+
+# ─── State ───────────────────────────────────────────────────────────────────
+
+def load_state(path: str = DIGEST_STATE_FILE) -> dict:
+    """{"<kind>:<window>|<chat id>": that digest's state} for the current window."""
+    p = Path(path)
+    if p.exists():
+        try:
+            with open(p) as f:
+                states = json.load(f)
+            if "window" not in states:  # Older files held a single digest's state
+                return states
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable digest state, starting a new digest: {e}")
+    return {}
+
+
+def save_state(state: dict, path: str = DIGEST_STATE_FILE) -> None:
+    with open(path, "w") as f:
+        json.dump(state, f)
+
+
+def _window_number(now: datetime | None = None) -> int:
+    """Window count, aligned to IST midnight so 12h windows split at 00:00/12:00 IST."""
+    now = now or datetime.now(timezone.utc)
+    return int((now.timestamp() + _IST_OFFSET_SECONDS) // (DIGEST_WINDOW_HOURS * 3600))
+
+
+def _window(kind: str, now: datetime | None = None) -> str:
+    return f"{kind}:{_window_number(now)}"
+
+
+def _store(state: dict, path: str) -> None:
+    """Save one digest's state next to the other kinds in this window; drop past windows."""
+    current = str(_window_number())
+    states = load_state(path)
+    states[f"{state['window']}|{state['chat_id']}"] = state
+    save_state({k: v for k, v in states.items() if v["window"].rsplit(":", 1)[1] == current}, path)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def _merge(shown: list[dict], fresh: list[dict], cap: int) -> list[dict]:
+    """Fresh articles first, then what was already shown; only the fields the formatter uses."""
+    urls = {a["url"] for a in fresh}
+    slim = [{k: a[k] for k in ("url", "title", "ai_summary") if a.get(k)} for a in fresh]
+    return (slim + [a for a in shown if a["url"] not in urls])[:cap]
+
+
+# ─── Sync ────────────────────────────────────────────────────────────────────
+
+def _sync(state: dict, render, path: str, bot_token: str | None) -> int:
+    """
+    Bring the channel in line with render(state), editing changed messages
+    and posting new ones. Returns the number of Telegram calls made.
+    """
+    from telegram_bot import post_message, edit_message
+
+    messages = render(state)
+    slots = state["messages"]
+    calls = 0
+    for i, text in enumerate(messages):
+        digest = _hash(text)
+        if i < len(slots) and slots[i]["hash"] == digest:
+            continue
+        if calls:
+            time.sleep(SEND_DELAY_SECONDS)
+        calls += 1
+
+        if i < len(slots):
+            status = edit_message(slots[i]["id"], text, state["chat_id"], bot_token)
+            if status == "error":
+                time.sleep(EDIT_RETRY_SECONDS)
+                calls += 1
+                status = edit_message(slots[i]["id"], text, state["chat_id"], bot_token)
+            if status == "ok":
+                slots[i]["hash"] = digest
+            elif status == "gone":
+                logger.warning("Digest message can no longer be edited — posting a fresh digest.")
+                state.update(header=None, messages=[])
+                return calls + _sync(state, render, path, bot_token)
+            else:
+                # Keep the old hash so the next run retries this edit
+                logger.warning(f"Digest edit of message {slots[i]['id']} failed twice — leaving it for the next run.")
+            continue
+
+        message_id = post_message(text, state["chat_id"], bot_token)
+        if message_id is None:
+            # Slots must line up with the rendered messages; start over next run
+            logger.warning("Digest post failed — the next run will post a fresh digest.")
+            state.update(header=None, messages=[])
+            break
+        slots.append({"id": message_id, "hash": digest})
+
+    if not DRY_RUN:
+        _store(state, path)
+    return calls
+
+
+def _load_window(kind: str, chat_id: str, path: str) -> dict:
+    window = _window(kind)
+    state = load_state(path).get(f"{window}|{chat_id}")
+    if state is None:
+        logger.info("New digest window — posting a fresh digest.")
+        state = {"window": window, "chat_id": chat_id, "header": None, "order": [], "articles": {}, "messages": []}
+    return state
+
+
+def update_digest(
+    categorised: dict[str, list[dict]],
+    kind: str = "all",
+    chat_id: str | None = None,
+    bot_token: str | None = None,
+    path: str = DIGEST_STATE_FILE,
+) -> int:
+    """
+    Edit-in-place counterpart of send_messages(format_full_digest(...)).
+    `kind` separates digests that shouldn't merge (e.g. one per category).
+    Returns the number of Telegram calls made.
+    """
+    from categories import CATEGORY_ORDER
+    from formatter import format_full_digest, format_header
+
+    state = _load_window(f"digest:{kind}", chat_id or TELEGRAM_CHANNEL_ID, path)
+    articles = state["articles"]
+    for key, fresh in categorised.items():
+        if fresh:
+            articles[key] = _merge(articles.get(key, []), fresh, MAX_ARTICLES_PER_CATEGORY)
+    # Categories keep the slot they first appeared in; newcomers go at the end
+    state["order"] += [k for k in CATEGORY_ORDER if articles.get(k) and k not in state["order"]]
+
+    def render(state: dict) -> list[str]:
+        state["header"] = state["header"] or format_header()
+        messages = format_full_digest(state["articles"], order=state["order"])
+        messages[0] = state["header"]
+        return messages
+
+    return _sync(state, render, path, bot_token)
+
+
+def update_top_stories(
+    top_stories: list[dict],
+    chat_id: str | None = None,
+    bot_token: str | None = None,
+    path: str = DIGEST_STATE_FILE,
+) -> int:
+    """
+    Edit-in-place counterpart of send_messages(format_top_stories(...)).
+    This run's ranked stories lead, followed by the window's earlier ones.
+    Returns the number of Telegram calls made.
+    """
+    from formatter import format_top_stories, format_dateline
+
+    state = _load_window("top", chat_id or TELEGRAM_CHANNEL_ID, path)
+    state["articles"]["top"] = _merge(state["articles"].get("top", []), top_stories, TOP_STORIES)
+
+    def render(state: dict) -> list[str]:
+        state["header"] = state["header"] or format_dateline()
+        return format_top_stories(state["articles"]["top"], dateline=state["header"])
+
+    return _sync(state, render, path, bot_token)
@@ -0,0 +1,178 @@
+"""
+NovaPulse — Feed Health
+Persistent per-feed health tracking and a circuit breaker for flaky feeds.
+
+Every fetch records its latency, outcome and article count. After
+FEED_FAILURE_THRESHOLD consecutive failures a feed's circuit opens and it
+is skipped until its cool-down expires; then a single probe is allowed
+through. A failed probe doubles the cool-down (up to FEED_MAX_COOLDOWN_HOURS),
+a successful one closes the circuit again.
+
+Usage:
+    python feed_health.py   # Rank feeds by time spent per useful article
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import (
+    FEED_HEALTH_FILE,
+    FEED_FAILURE_THRESHOLD,
+    FEED_COOLDOWN_HOURS,
+    FEED_MAX_COOLDOWN_HOURS,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_LATENCY_SAMPLES = 50  # Rolling window for latency percentiles
+
+
+# ─── Persistence ─────────────────────────────────────────────────────────────
+
+def load_health() -> dict[str, dict]:
+    p = Path(FEED_HEALTH_FILE)
+    if p.exists():
+        try:
+            with open(p) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Feed health file unreadable, starting fresh: {e}")
+    return {}
+
+
+def save_health(health: dict[str, dict]) -> None:
+    with open(FEED_HEALTH_FILE, "w") as f:
+        json.dump(health, f, indent=1)
+
+
+def _stats(health: dict[str, dict], feed_url: str) -> dict:
+    return health.setdefault(feed_url, {
+        "attempts": 0,
+        "successes": 0,
+        "consecutive_failures": 0,
+        "latencies": [],
+        "total_seconds": 0.0,
+        "articles": 0,
+        "useful": 0,
+        "last_error": None,
+        "open_until": None,
+        "cooldown_hours": 0,
+    })
+
+
+# ─── Circuit Breaker ─────────────────────────────────────────────────────────
+
+def allow(health: dict[str, dict], feed_url: str, now: datetime | None = None) -> bool:
+    """True if the feed should be fetched this run (closed, or due a probe)."""
+    open_until = health.get(feed_url, {}).get("open_until")
+    if not open_until:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return now.timestamp() >= open_until
+
+
+def record_result(
+    health: dict[str, dict],
+    feed_url: str,
+    elapsed: float,
+    n_articles: int,
+    error: str | None,
+    now: datetime | None = None,
+) -> None:
+    """Update a feed's stats after a fetch and open/close its circuit."""
+    now = now or datetime.now(timezone.utc)
+    s = _stats(health, feed_url)
+    s["attempts"] += 1
+    s["total_seconds"] += elapsed
+    s["latencies"] = (s["latencies"] + [round(elapsed, 3)])[-MAX_LATENCY_SAMPLES:]
+
+    if error is None:
+        if s["open_until"]:
+            logger.info(f"  Feed recovered, closing circuit: {feed_url}")
+        s["successes"] += 1
+        s["consecutive_failures"] = 0
+        s["articles"] += n_articles
+        s["open_until"] = None
+        s["cooldown_hours"] = 0
+        return
+
+    s["consecutive_failures"] += 1
+    s["last_error"] = error
+    if s["open_until"]:
+        # Failed probe: back off further
+        s["cooldown_hours"] = min(s["cooldown_hours"] * 2, FEED_MAX_COOLDOWN_HOURS)
+    elif s["consecutive_failures"] >= FEED_FAILURE_THRESHOLD:
+        s["cooldown_hours"] = FEED_COOLDOWN_HOURS
+    else:
+        return
+    s["open_until"] = now.timestamp() + s["cooldown_hours"] * 3600
+    logger.warning(
+        f"  Circuit open for {feed_url} after {s['consecutive_failures']} failures "
+        f"— next probe in {s['cooldown_hours']}h"
+    )
+
+
+def record_useful(articles: list[dict]) -> None:
+    """Credit each feed with the fresh (not previously posted) articles it supplied."""
+    health = load_health()
+    for a in articles:
+        if a.get("source") in health:
+            health[a["source"]]["useful"] += 1
+    save_health(health)
+
+
+# ─── Reporting ───────────────────────────────────────────────────────────────
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def health_report(health: dict[str, dict]) -> list[dict]:
+    """
+    One row per feed, most expensive first: seconds spent fetching per
+    useful article contributed. Feeds that never contributed sort by total
+    time spent, ahead of everything that did.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    rows = []
+    for url, s in health.items():
+        attempts = s["attempts"] or 1
+        rows.append({
+            "url": url,
+            "state": "open" if s["open_until"] and s["open_until"] > now else "closed",
+            "success_rate": s["successes"] / attempts,
+            "p50": _percentile(s["latencies"], 50),
+            "p95": _percentile(s["latencies"], 95),
+            "consecutive_failures": s["consecutive_failures"],
+            "useful": s["useful"],
+            "total_seconds": s["total_seconds"],
+            "cost_per_useful": s["total_seconds"] / s["useful"] if s["useful"] else None,
+        })
+    rows.sort(key=lambda r: (
+        r["cost_per_useful"] is not None,
+        -(r["cost_per_useful"] or r["total_seconds"]),
+    ))
+    return rows
+
+
+def main() -> None:
+    rows = health_report(load_health())
+    if not rows:
+        print("No feed health data yet.")
+        return
+    print(f"{'state':<6} {'ok%':>5} {'p50s':>6} {'p95s':>6} {'fails':>5} {'useful':>6} {'s/useful':>8}  feed")
+    for r in rows:
+        cost = f"{r['cost_per_useful']:.2f}" if r["cost_per_useful"] is not None else "—"
+        print(
+            f"{r['state']:<6} {r['success_rate'] * 100:>5.0f} {r['p50']:>6.2f} {r['p95']:>6.2f} "
+            f"{r['consecutive_failures']:>5} {r['useful']:>6} {cost:>8}  {r['url']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
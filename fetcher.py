@@ -4,80 +4,397 @@ Pulls articles from RSS feeds and (optionally) NewsAPI.
 Returns a flat list of normalised article dicts.
 """
 
-import feedparser
-import requests
+import html
+import json
 import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
-from config import NEWS_API_KEY
-from categories import GLOBAL_RSS_FEEDS, CATEGORIES
+from email.utils import parsedate_to_datetime
+from itertools import repeat
+from pathlib import Path
+from config import (
+    NEWS_API_KEY,
+    RSS_STREAMING,
+    RSS_WORKERS,
+    WATERMARK_FILE,
+    WATERMARK_MAX_LOOKBACK_HOURS,
+)
 
 logger = logging.getLogger(__name__)
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
-def _parse_date(entry) -> datetime:
-    """Best-effort publish-date extraction from a feedparser entry."""
+def _parse_date(entry) -> datetime | None:
+    """Best-effort publish-date extraction from a feedparser entry (None if undated)."""
     if hasattr(entry, "published_parsed") and entry.published_parsed:
         return datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
     if hasattr(entry, "updated_parsed") and entry.updated_parsed:
         return datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-    return datetime.now(timezone.utc)
+    return None
 
 
-def _is_recent(pub_date: datetime, hours: int = 12) -> bool:
-    """Only keep articles published within the last N hours."""
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    return pub_date >= cutoff
-
-
-def _normalise(entry, source_url: str) -> dict:
-    """Turn a feedparser entry into a standard article dict."""
-    return {
+def _normalise(entry, source_url: str) -> tuple[dict, str]:
+    """Turn a feedparser entry into (standard article dict, entry id)."""
+    article = {
         "title": getattr(entry, "title", "No title").strip(),
         "url": getattr(entry, "link", ""),
         "summary": getattr(entry, "summary", "")[:300].strip(),
         "published": _parse_date(entry),
         "source": source_url,
     }
+    return article, entry.get("id") or article["url"]
+
+
+# ─── Streaming Parser ────────────────────────────────────────────────────────
+# Reads the feed off the socket chunk by chunk and builds articles straight
+# from the XML elements, so we can stop as soon as entries fall out of the
+# window instead of parsing (and sanitising) the whole document first.
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_ENTRY_TAGS = {"item", _ATOM + "entry", _RSS1 + "item"}
+
+# Entry child tag → article field. Exact tags only: extension namespaces
+# (media:title, media:content, …) must not overwrite the real fields.
+_FIELD_TAGS = {
+    "title": "title", _ATOM + "title": "title", _RSS1 + "title": "title",
+    "link": "link", _ATOM + "link": "link", _RSS1 + "link": "link",
+    "guid": "id", _ATOM + "id": "id",
+    "description": "summary", _ATOM + "summary": "summary", _RSS1 + "description": "summary",
+    _CONTENT + "encoded": "content", _ATOM + "content": "content",
+    "pubDate": "published", _ATOM + "published": "published", _DC + "date": "published",
+    _ATOM + "updated": "updated",
+}
+
+STALE_STREAK_LIMIT = 3      # Stop after N too-old entries in a row (feeds are newest-first)
+_SUMMARY_SCAN_CHARS = 2000  # Raw HTML needed to reliably yield 300 chars of text
+_CHUNK_BYTES = 16 * 1024
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_WS_RE = re.compile(r"\s+")
+
+_USER_AGENT = "NovaPulse/1.0 (+https://github.com/kpchaudhari/NovaPulse)"
+
+
+def _parse_text_date(value: str) -> datetime | None:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom, dc:date) timestamp."""
+    value = value.strip()
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _clean_summary(raw: str) -> str:
+    """
+    Plain-text excerpt of an HTML description. Only the first few KB are
+    looked at — we keep 300 chars, so there's no point cleaning the rest.
+    """
+    text = _TAG_RE.sub(" ", raw[:_SUMMARY_SCAN_CHARS])
+    return _WS_RE.sub(" ", html.unescape(text))[:300].strip()
+
+
+def _normalise_element(elem: ET.Element, source_url: str) -> tuple[dict, str]:
+    """Turn an RSS <item> / Atom <entry> element into (article dict, entry id)."""
+    title, url, guid, summary, content = "", "", "", "", ""
+    published = updated = None
+    for child in elem:
+        name = _FIELD_TAGS.get(child.tag)
+        text = child.text or ""
+        if name == "title":
+            title = text
+        elif name == "link":
+            href = child.get("href")
+            if href is None:
+                url = url or text.strip()
+            elif child.get("rel", "alternate") == "alternate":
+                url = url or href
+        elif name == "id":
+            guid = text.strip()
+        elif name == "summary":
+            summary = text
+        elif name == "content":
+            content = text
+        elif name == "published":
+            published = published or _parse_text_date(text)
+        elif name == "updated":
+            updated = updated or _parse_text_date(text)
+
+    if not url and guid.startswith("http"):
+        url = guid
+    article = {
+        "title": title.strip() or "No title",
+        "url": url,
+        # Only touch the full content body when there's no short description
+        "summary": _clean_summary(summary or content),
+        "published": published or updated,
+        "source": source_url,
+    }
+    return article, guid or url
+
+
+def _iter_streaming(feed_url: str):
+    """
+    Stream a feed through an incremental XML parser, yielding
+    (article, entry id) pairs as each entry closes. Closing the generator
+    closes the connection. Raises ET.ParseError on malformed XML.
+    """
+    import requests
+
+    parser = ET.XMLPullParser(events=("end",))
+    with requests.get(
+        feed_url, stream=True, timeout=15, headers={"User-Agent": _USER_AGENT}
+    ) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(chunk_size=_CHUNK_BYTES):
+            parser.feed(chunk)
+            for _event, elem in parser.read_events():
+                if elem.tag in _ENTRY_TAGS:
+                    entry = _normalise_element(elem, feed_url)
+                    elem.clear()
+                    yield entry
+        parser.close()
+
+
+# ─── Watermarks ──────────────────────────────────────────────────────────────
+
+MAX_UNDATED_IDS = 200  # Per feed; enough to cover any feed's full item list
+
+_pending_watermarks: dict[str, dict] = {}
+
+
+def load_watermarks(path: str = WATERMARK_FILE) -> dict[str, dict]:
+    p = Path(path)
+    if p.exists():
+        try:
+            with open(p) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Watermark file unreadable, falling back to time window: {e}")
+    return {}
+
+
+def commit_watermarks(path: str = WATERMARK_FILE) -> None:
+    """Persist the marks from this run's incremental fetch (call once the run succeeded)."""
+    if not _pending_watermarks:
+        return
+    marks = load_watermarks(path)
+    marks.update(_pending_watermarks)
+    with open(path, "w") as f:
+        json.dump(marks, f, indent=1)
+    logger.info(f"Saved watermarks for {len(_pending_watermarks)} feeds.")
+    _pending_watermarks.clear()
 
 
 # ─── RSS Fetcher ─────────────────────────────────────────────────────────────
 
-def fetch_rss(feed_url: str, hours: int = 12) -> list[dict]:
-    """Fetch and parse a single RSS feed, returning recent articles."""
-    articles = []
+def _iter_feedparser(feed_url: str):
+    """Tolerant full-document parse for feeds the streaming parser rejects."""
+    import feedparser
+
+    feed = feedparser.parse(feed_url)
+    status = feed.get("status")
+    if status and status >= 400:
+        raise RuntimeError(f"HTTP {status}")
+    if feed.bozo and not feed.entries:
+        raise RuntimeError(f"unparseable feed: {feed.bozo_exception}")
+
+    for entry in feed.entries:
+        yield _normalise(entry, feed_url)
+
+
+def _select(entries, cutoff: datetime, mark: dict | None, now: datetime, stop_early: bool):
+    """
+    Keep the entries newer than the feed's high-water mark (or `cutoff`
+    when it has none) and compute the new mark.
+
+    A mark is {"ts": newest entry timestamp, "guids": ids seen at exactly
+    that timestamp, "undated": ids of entries without any date}. Undated
+    entries are new only if their id hasn't been seen before; they are
+    stamped with the run time. Entries dated after `now` (feeds with a
+    wrong timezone) are treated as undated, so they can never push the
+    mark into the future and hide real entries published before it.
+    With `stop_early`, reading stops after STALE_STREAK_LIMIT consecutive
+    old entries (feeds are newest-first). Undated entries can sit anywhere,
+    though, so the whole feed is still read when it is known to carry them
+    (its mark lists undated ids, or one turns up this run) and on its first
+    incremental fetch (`mark` == {}); dated entries past the streak are
+    just dropped. Window-only fetches (`mark` None) skip an undated tail.
+    Returns (articles, new_mark).
+    """
+    scan_all = mark is not None and (not mark or bool(mark.get("undated")))
+    mark = mark or {}
+    mark_ts = mark.get("ts")
+    mark_ids = set(mark.get("guids", []))
+    undated = list(mark.get("undated", []))
+    undated_ids = set(undated)
+    floor = cutoff.timestamp()
+
+    new_ts, new_ids = mark_ts, set(mark_ids)
+    articles, stale = [], 0
+    for article, entry_id in entries:
+        pub = article["published"]
+        if pub is None or pub > now:
+            scan_all = True
+            if entry_id in undated_ids:
+                continue
+            undated_ids.add(entry_id)
+            undated.append(entry_id)
+            article["published"] = now
+        else:
+            ts = pub.timestamp()
+            seen = mark_ts is not None and (ts < mark_ts or (ts == mark_ts and entry_id in mark_ids))
+            if ts < floor or seen:
+                stale += 1
+                if stop_early and stale >= STALE_STREAK_LIMIT and not scan_all:
+                    break
+                continue
+            stale = 0
+            if new_ts is None or ts > new_ts:
+                new_ts, new_ids = ts, {entry_id}
+            elif ts == new_ts:
+                new_ids.add(entry_id)
+        if article["url"]:
+            articles.append(article)
+
+    new_mark = {"ts": new_ts, "guids": sorted(new_ids), "undated": undated[-MAX_UNDATED_IDS:]}
+    return articles, new_mark
+
+
+def fetch_feed(
+    feed_url: str,
+    cutoff: datetime,
+    mark: dict | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """
+    Fetch one feed and report how it went:
+    {"url", "articles", "watermark", "elapsed" (seconds), "error" (None on success)}.
+    Entries at or before the feed's watermark `mark` (or before `cutoff`
+    if it has none) are skipped.
+    """
+    now = now or datetime.now(timezone.utc)
+    t0 = time.perf_counter()
+    articles, watermark, error = [], mark, None
     try:
-        feed = feedparser.parse(feed_url)
-        for entry in feed.entries:
-            article = _normalise(entry, feed_url)
-            if article["url"] and _is_recent(article["published"], hours):
-                articles.append(article)
+        if RSS_STREAMING:
+            entries = _iter_streaming(feed_url)
+            try:
+                articles, watermark = _select(entries, cutoff, mark, now, stop_early=True)
+            except ET.ParseError as e:
+                logger.info(f"Streaming parse failed for {feed_url} ({e}), retrying with feedparser")
+                articles, watermark = _select(_iter_feedparser(feed_url), cutoff, mark, now, stop_early=False)
+            finally:
+                entries.close()
+        else:
+            articles, watermark = _select(_iter_feedparser(feed_url), cutoff, mark, now, stop_early=False)
     except Exception as e:
+        error = f"{type(e).__name__}: {e}"
         logger.warning(f"RSS fetch failed for {feed_url}: {e}")
-    return articles
+    return {
+        "url": feed_url,
+        "articles": articles,
+        "watermark": watermark,
+        "elapsed": time.perf_counter() - t0,
+        "error": error,
+    }
+
+
+def fetch_rss(feed_url: str, hours: int = 12) -> list[dict]:
+    """Fetch and parse a single RSS feed, returning recent articles."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return fetch_feed(feed_url, cutoff)["articles"]
+
+
+def default_feeds() -> list[str]:
+    """Global feeds + every category-specific feed, deduplicated (see category_build)."""
+    from category_build import load
+    return load()["feeds"]
+
 
+def fetch_all_rss(
+    hours: int = 12,
+    incremental: bool = False,
+    feeds: list[str] | None = None,
+    watermark_file: str = WATERMARK_FILE,
+    mp_context=None,
+    feeds_by_url: dict[str, set[str]] | None = None,
+) -> list[dict]:
+    """
+    Fetch from global feeds + every category-specific feed (or `feeds`).
+    Feeds are fetched and parsed in a process pool (RSS_WORKERS) so the
+    CPU-bound XML work of large feeds runs in parallel. Feeds whose
+    circuit is open (see feed_health.py) are skipped until their next probe.
+    Callers running threads pass a "spawn" `mp_context`: forking a
+    multi-threaded process can deadlock the workers. An article listed by
+    several feeds keeps the first one as its `source`; pass a dict as
+    `feeds_by_url` to collect every feed that listed each URL.
+
+    With `incremental`, each feed only returns entries newer than its
+    high-water mark from the last committed run (looking back at most
+    WATERMARK_MAX_LOOKBACK_HOURS); feeds without a mark use the `hours`
+    window. New marks are held until commit_watermarks() is called.
+    Runners with their own fetch cadence (tenants.py) pass their own
+    `watermark_file` so they don't consume each other's new entries.
+    """
+    from feed_health import load_health, save_health, allow, record_result
+
+    all_feeds = set(feeds) if feeds is not None else set(default_feeds())
+
+    health = load_health()
+    feeds = sorted(f for f in all_feeds if allow(health, f))
+    skipped = len(all_feeds) - len(feeds)
+    if skipped:
+        logger.info(f"  Skipping {skipped} feeds with an open circuit")
 
-def fetch_all_rss(hours: int = 12) -> list[dict]:
-    """Fetch from global feeds + every category-specific feed."""
-    all_feeds = set(GLOBAL_RSS_FEEDS)
-    for cat in CATEGORIES.values():
-        all_feeds.update(cat.get("rss_feeds", []))
+    # One clock reading for the whole run
+    now = datetime.now(timezone.utc)
+    window = now - timedelta(hours=hours)
+    floor = now - timedelta(hours=WATERMARK_MAX_LOOKBACK_HOURS)
+    marks = load_watermarks(watermark_file) if incremental else {}
+    # {} rather than None for a feed's first incremental fetch: see _select
+    feed_marks = [marks.get(f, {}) if incremental else None for f in feeds]
+    cutoffs = [
+        max(datetime.fromtimestamp(m["ts"], timezone.utc), floor) if m and m.get("ts") else window
+        for m in feed_marks
+    ]
+
+    if RSS_WORKERS > 1 and len(feeds) > 1:
+        with ProcessPoolExecutor(max_workers=min(RSS_WORKERS, len(feeds)), mp_context=mp_context) as pool:
+            results = list(pool.map(fetch_feed, feeds, cutoffs, feed_marks, repeat(now)))
+    else:
+        results = [fetch_feed(*args, now) for args in zip(feeds, cutoffs, feed_marks)]
 
     articles = []
-    for feed_url in all_feeds:
-        fetched = fetch_rss(feed_url, hours)
-        logger.info(f"  RSS [{len(fetched):>2}] {feed_url}")
-        articles.extend(fetched)
+    for r in results:
+        record_result(health, r["url"], r["elapsed"], len(r["articles"]), r["error"])
+        logger.info(f"  RSS [{len(r['articles']):>2}] {r['elapsed']:>5.1f}s {r['url']}")
+        articles.extend(r["articles"])
+        if incremental and r["error"] is None:
+            _pending_watermarks[r["url"]] = r["watermark"]
+    save_health(health)
 
     # Deduplicate by URL
     seen = set()
     unique = []
     for a in articles:
+        if feeds_by_url is not None:
+            feeds_by_url.setdefault(a["url"], set()).add(a["source"])
         if a["url"] not in seen:
             seen.add(a["url"])
             unique.append(a)
 
-    logger.info(f"RSS total: {len(unique)} unique articles in last {hours}h")
+    scope = "since each feed's watermark" if incremental else f"in last {hours}h"
+    logger.info(f"RSS total: {len(unique)} unique articles {scope}")
     return unique
 
 
@@ -85,40 +402,18 @@ def fetch_all_rss(hours: int = 12) -> list[dict]:
 
 def fetch_newsapi(hours: int = 12) -> list[dict]:
     """
-    Fetch from NewsAPI free tier (100 req/day).
+    Fetch from NewsAPI free tier (100 req/day) through the quota-aware
+    client in newsapi_client.py.
     Returns [] gracefully if key is missing or quota exceeded.
     """
     if not NEWS_API_KEY:
         logger.info("NewsAPI key not set — skipping NewsAPI fetch.")
         return []
 
-    from_dt = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
-    params = {
-        "q": "artificial intelligence OR AI OR machine learning OR LLM OR generative AI",
-        "language": "en",
-        "sortBy": "publishedAt",
-        "from": from_dt,
-        "pageSize": 100,
-        "apiKey": NEWS_API_KEY,
-    }
+    from newsapi_client import fetch_everything
+
     try:
-        resp = requests.get("https://newsapi.org/v2/everything", params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        articles = []
-        for item in data.get("articles", []):
-            if item.get("url") and item.get("title"):
-                articles.append({
-                    "title": item["title"].strip(),
-                    "url": item["url"],
-                    "summary": (item.get("description") or "")[:300].strip(),
-                    "published": datetime.fromisoformat(
-                        item["publishedAt"].replace("Z", "+00:00")
-                    ),
-                    "source": item.get("source", {}).get("name", "NewsAPI"),
-                })
-        logger.info(f"NewsAPI: {len(articles)} articles")
-        return articles
+        return fetch_everything(hours)
     except Exception as e:
         logger.warning(f"NewsAPI fetch failed: {e}")
         return []
@@ -126,9 +421,16 @@ def fetch_newsapi(hours: int = 12) -> list[dict]:
 
 # ─── Main Entry ──────────────────────────────────────────────────────────────
 
-def fetch_all_articles(hours: int = 12) -> list[dict]:
-    """Aggregate articles from all sources."""
-    articles = fetch_all_rss(hours) + fetch_newsapi(hours)
+def fetch_all_articles(
+    hours: int = 12,
+    incremental: bool = False,
+    feeds: list[str] | None = None,
+    watermark_file: str = WATERMARK_FILE,
+    feeds_by_url: dict[str, set[str]] | None = None,
+) -> list[dict]:
+    """Aggregate articles from all sources (see fetch_all_rss for the keyword arguments)."""
+    rss = fetch_all_rss(hours, incremental, feeds, watermark_file, feeds_by_url=feeds_by_url)
+    articles = rss + fetch_newsapi(hours)
     # Final dedup by URL
     seen = set()
     unique = []
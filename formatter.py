@@ -11,16 +11,20 @@ from config import MAX_ARTICLES_PER_CATEGORY
 
 # ─── Header / Footer ──────────────────────────────────────────────────────────
 
-HEADER_TEMPLATE = """🧠 <b>BuzzWordAI</b> — Your Daily AI Pulse
+BRAND = "BuzzWordAI"
+
+HEADER_TEMPLATE = """🧠 <b>{brand}</b> — Your Daily AI Pulse
 📅 <i>{date} • {time} IST</i>
 ━━━━━━━━━━━━━━━━━━━━━━
 
 Here's what's happening in the world of AI 👇"""
 
-FOOTER = """━━━━━━━━━━━━━━━━━━━━━━
-💡 <i>Curated by AI, powered by</i> <b>BuzzWordAI</b>
+FOOTER_TEMPLATE = """━━━━━━━━━━━━━━━━━━━━━━
+💡 <i>Curated by AI, powered by</i> <b>{brand}</b>
 📢 Share with your tech crew! ⚡"""
 
+FOOTER = FOOTER_TEMPLATE.format(brand=BRAND)
+
 
 def _now_ist() -> tuple[str, str]:
     """Return current date and time in IST as strings."""
@@ -29,16 +33,26 @@ def _now_ist() -> tuple[str, str]:
     return ist.strftime("%d %b %Y"), ist.strftime("%I:%M %p")
 
 
-def format_header() -> str:
+def format_dateline() -> str:
     date, time = _now_ist()
-    return HEADER_TEMPLATE.format(date=date, time=time)
+    return f"{date} • {time} IST"
+
+
+def format_header(brand: str = BRAND) -> str:
+    date, time = _now_ist()
+    return HEADER_TEMPLATE.format(brand=brand, date=date, time=time)
 
 
 # ─── Category Block ───────────────────────────────────────────────────────────
 
-def format_category_block(cat_key: str, articles: list[dict]) -> str:
+def format_category_block(
+    cat_key: str,
+    articles: list[dict],
+    categories: dict[str, dict] | None = None,
+    max_articles: int = MAX_ARTICLES_PER_CATEGORY,
+) -> str:
     """Format a single category into a visually rich Telegram HTML block."""
-    cat = CATEGORIES[cat_key]
+    cat = (categories or CATEGORIES)[cat_key]
     emoji = cat["emoji"]
     title = cat["title"]
 
@@ -47,7 +61,7 @@ def format_category_block(cat_key: str, articles: list[dict]) -> str:
         "",
     ]
 
-    for idx, article in enumerate(articles[:MAX_ARTICLES_PER_CATEGORY]):
+    for idx, article in enumerate(articles[:max_articles]):
         url = article["url"]
         ai_summary = article.get("ai_summary", "")
 
@@ -70,25 +84,33 @@ def format_category_block(cat_key: str, articles: list[dict]) -> str:
 
 # ─── Full Digest ──────────────────────────────────────────────────────────────
 
-def format_full_digest(categorised: dict[str, list[dict]]) -> list[str]:
+def format_full_digest(
+    categorised: dict[str, list[dict]],
+    categories: dict[str, dict] | None = None,
+    order: list[str] | None = None,
+    brand: str = BRAND,
+    max_articles: int = MAX_ARTICLES_PER_CATEGORY,
+) -> list[str]:
     """
     Build a list of Telegram messages.
     Telegram has a 4096-char limit per message, so we split by category.
     Returns [header_msg, cat1_msg, cat2_msg, ..., footer_msg]
+    `categories`, `order`, `brand` and `max_articles` default to this
+    channel's own settings; multi-tenant runs pass their own.
     """
-    messages = [format_header()]
+    messages = [format_header(brand)]
 
-    for cat_key in CATEGORY_ORDER:
+    for cat_key in order or CATEGORY_ORDER:
         articles = categorised.get(cat_key, [])
         if not articles:
             continue
-        block = format_category_block(cat_key, articles)
+        block = format_category_block(cat_key, articles, categories, max_articles)
         # Telegram limit safety: chunk if > 4000 chars
         if len(block) > 4000:
             block = block[:3997] + "…"
         messages.append(block)
 
-    messages.append(FOOTER)
+    messages.append(FOOTER_TEMPLATE.format(brand=brand))
     return messages
 
 
@@ -105,16 +127,21 @@ def format_summary_line(categorised: dict[str, list[dict]]) -> str:
 
 # ─── Top Stories (single message) ────────────────────────────────────────────
 
-def format_top_stories(articles: list[dict]) -> list[str]:
+def format_top_stories(
+    articles: list[dict],
+    brand: str = BRAND,
+    heading: str = "Top AI Stories",
+    dateline: str | None = None,
+) -> list[str]:
     """
     Format a flat list of ranked articles into a SINGLE Telegram message.
-    Used for "All Categories" mode — one consolidated Top 10 message.
+    Used for "All Categories" mode — one consolidated Top 10 message — and
+    for the weekly/monthly roll-ups, which pass their own heading and dateline.
     """
-    date, time = _now_ist()
-
+    dateline = dateline or format_dateline()
     lines = [
-        f"🧠 <b>BuzzWordAI — Top AI Stories</b>",
-        f"📅 <i>{date} • {time} IST</i>",
+        f"🧠 <b>{brand} — {heading}</b>",
+        f"📅 <i>{dateline}</i>",
         "━━━━━━━━━━━━━━━━━━━━━━",
         "",
     ]
@@ -135,7 +162,7 @@ def format_top_stories(articles: list[dict]) -> list[str]:
         lines.append("")
 
     lines.append("━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append('💡 <i>Curated by AI, powered by</i> <b>BuzzWordAI</b>')
+    lines.append(f'💡 <i>Curated by AI, powered by</i> <b>{brand}</b>')
     lines.append("📢 Share with your tech crew! ⚡")
 
     msg = "\n".join(lines)
@@ -144,3 +171,21 @@ def format_top_stories(articles: list[dict]) -> list[str]:
     if len(msg) > 4000:
         return [msg[:3997] + "…"]
     return [msg]
+
+
+# ─── Breaking News (single alert) ────────────────────────────────────────────
+
+def format_breaking(article: dict, coverage: int = 1, brand: str = BRAND) -> str:
+    """One-story alert posted by the breaking-news watcher."""
+    url = article["url"]
+    text = article.get("ai_summary") or article["title"]
+    text = text.replace("<", "&lt;").replace(">", "&gt;")
+    lines = [
+        f"🚨 <b>{brand} — Breaking AI News</b>",
+        "",
+        f"▸ {text}",
+        f'   🔗 <a href="{url}">Read more</a>',
+    ]
+    if coverage > 1:
+        lines += ["", f"📰 <i>Covered by {coverage} sources</i>"]
+    return "\n".join(lines)
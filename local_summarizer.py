@@ -0,0 +1,153 @@
+"""
+NovaPulse — Local Summarizer
+CPU-only fallback engine for when Gemini is unavailable, out of quota or
+out of time. Produces the same `ai_summary` field the Gemini path does:
+
+  - summarize_category_local: TextRank-style extractive summary per
+    article, picking the most central sentence(s) of title + description.
+  - rank_top_stories_local: clusters near-duplicate headlines across
+    sources and ranks stories by coverage, AI keyword signal and recency.
+"""
+
+import math
+import re
+from datetime import datetime, timezone
+
+from config import MAX_ARTICLES_PER_CATEGORY
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the and or but of to in on for with at by from as is are was were be "
+    "been it its this that these those has have had will would can could new "
+    "how why what who says said after over into about than more".split()
+)
+
+MAX_SUMMARY_CHARS = 220
+CLUSTER_SIMILARITY = 0.35  # Title-token Jaccard above which two articles are the same story
+
+
+def _words(text: str) -> set[str]:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+# ─── Extractive Summary ──────────────────────────────────────────────────────
+
+def _similarity(a: set[str], b: set[str]) -> float:
+    """TextRank sentence similarity: shared words normalised by sentence lengths."""
+    if len(a) < 2 or len(b) < 2:
+        return 0.0
+    return len(a & b) / (math.log(len(a)) + math.log(len(b)))
+
+
+def _textrank(sentences: list[str], damping: float = 0.85, iterations: int = 30) -> list[float]:
+    words = [_words(s) for s in sentences]
+    n = len(sentences)
+    weights = [[_similarity(words[i], words[j]) if i != j else 0.0 for j in range(n)] for i in range(n)]
+    out_sums = [sum(row) for row in weights]
+    scores = [1.0] * n
+    for _ in range(iterations):
+        scores = [
+            (1 - damping) + damping * sum(
+                weights[j][i] / out_sums[j] * scores[j] for j in range(n) if out_sums[j]
+            )
+            for i in range(n)
+        ]
+    return scores
+
+
+def _redundant(a: str, b: str) -> bool:
+    """True if most of the shorter sentence's words already appear in the other."""
+    wa, wb = _words(a), _words(b)
+    return bool(wa and wb) and len(wa & wb) / min(len(wa), len(wb)) >= 0.5
+
+
+def summarize_text(title: str, description: str) -> str:
+    """
+    Best 1-2 sentences from title + description. The title competes as a
+    sentence too, so headline-only items still get a sensible summary.
+    """
+    title = title.strip()
+    body = [s.strip() for s in _SENTENCE_RE.split(description.strip()) if len(s.strip()) > 20]
+    # The feed description is often cut mid-sentence at 300 chars
+    if body and not body[-1].endswith((".", "!", "?")):
+        body.pop()
+    if not body:
+        return title
+
+    sentences = [title] + body
+    scores = _textrank(sentences)
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+
+    picked: list[int] = []
+    length = 0
+    for i in ranked:
+        if picked and (length + len(sentences[i]) > MAX_SUMMARY_CHARS or _redundant(sentences[i], sentences[picked[0]])):
+            continue
+        picked.append(i)
+        length += len(sentences[i])
+        if len(picked) == 2:
+            break
+    parts = [sentences[i] for i in sorted(picked)]
+    if len(parts) > 1 and not parts[0].endswith((".", "!", "?")):
+        parts[0] += "."
+    summary = " ".join(parts)
+    return summary if len(summary) <= MAX_SUMMARY_CHARS else summary[: MAX_SUMMARY_CHARS - 1] + "…"
+
+
+def summarize_category_local(
+    cat_key: str,
+    articles: list[dict],
+    max_articles: int = MAX_ARTICLES_PER_CATEGORY,
+) -> list[dict]:
+    """Local drop-in for summarizer.summarize_category."""
+    capped = articles[:max_articles]
+    for article in capped:
+        article["ai_summary"] = summarize_text(article.get("title", ""), article.get("summary", ""))
+    return capped
+
+
+# ─── Local Ranker ────────────────────────────────────────────────────────────
+
+def cluster(articles: list[dict]) -> list[list[dict]]:
+    """Greedily group articles whose titles describe the same story."""
+    clusters: list[tuple[set[str], list[dict]]] = []
+    for article in articles:
+        words = _words(article.get("title", ""))
+        for rep_words, members in clusters:
+            union = words | rep_words
+            if union and len(words & rep_words) / len(union) >= CLUSTER_SIMILARITY:
+                members.append(article)
+                break
+        else:
+            clusters.append((words, [article]))
+    return [members for _, members in clusters]
+
+
+def rank_top_stories_local(articles: list[dict], n: int = 10) -> list[dict]:
+    """
+    Local drop-in for summarizer.summarize_top_stories. One article per
+    story cluster, scored by how many sources covered it, how many
+    categories' keywords it hits and how recent it is. Each returned copy
+    carries `ai_summary` and `cluster_size`.
+    """
+    from classifier import classify
+
+    now = datetime.now(timezone.utc)
+    scored = []
+    for members in cluster(articles):
+        lead = max(members, key=lambda a: len(a.get("summary", "")))
+        hits = [c for c in classify(lead) if c != "products"]
+        age_hours = max(0.0, (now - min(a["published"] for a in members)).total_seconds() / 3600)
+        sources = {a.get("source") for a in members}
+        score = 2.0 * math.log1p(len(sources)) + 0.5 * len(hits) + 1.0 / (1 + age_hours / 6)
+        scored.append((score, lead, len(members)))
+
+    scored.sort(key=lambda s: s[0], reverse=True)
+    result = []
+    for _, lead, size in scored[:n]:
+        article = lead.copy()
+        article["ai_summary"] = summarize_text(lead.get("title", ""), lead.get("summary", ""))
+        article["cluster_size"] = size
+        result.append(article)
+    return result
@@ -3,22 +3,30 @@ NovaPulse — Main Orchestrator
 Run this script to fetch, classify, format, and post the AI digest.
 
 Usage:
-    python news_bot.py               # Normal run → posts to Telegram
-    DRY_RUN=true python news_bot.py  # Print messages, do not send
+    python news_bot.py                    # Normal run → posts to Telegram
+    DRY_RUN=true python news_bot.py       # Print messages, do not send
+    python news_bot.py --profile-startup  # Import-time breakdown, no network
+    python news_bot.py --profile cpu      # Per-stage cProfile stats → profiles/
+    python news_bot.py --profile mem --profile-dir out/  # Per-stage tracemalloc reports
+
+Pipeline modules (and their heavy dependencies such as feedparser and
+requests) are imported lazily, right before the stage that needs them,
+so a cold start reaches its first network request as early as possible.
 """
 
-import json
+import time
+
+_T_START = time.perf_counter()
+
+import argparse
+import importlib
 import logging
 import os
 import sys
-from pathlib import Path
 
-from config import SEEN_URLS_FILE, MAX_SEEN_URLS
-from fetcher import fetch_all_articles
-from classifier import classify_all
-from summarizer import summarize_all, summarize_top_stories
-from formatter import format_full_digest, format_top_stories, format_summary_line
-from telegram_bot import send_messages, send_message
+from config import DELIVERY_MODE
+from posted import load_seen_urls, save_seen_urls, filter_seen, recent_alerts
+from profiling import stage, configure as configure_profiling
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -29,25 +37,90 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# ─── Deduplication ───────────────────────────────────────────────────────────
-
-def load_seen_urls() -> set[str]:
-    p = Path(SEEN_URLS_FILE)
-    if p.exists():
-        with open(p) as f:
-            return set(json.load(f))
-    return set()
-
-
-def save_seen_urls(seen: set[str]) -> None:
-    # Keep only the last MAX_SEEN_URLS to avoid the file growing forever
-    trimmed = list(seen)[-MAX_SEEN_URLS:]
-    with open(SEEN_URLS_FILE, "w") as f:
-        json.dump(trimmed, f)
-
-
-def filter_seen(articles: list[dict], seen: set[str]) -> list[dict]:
-    return [a for a in articles if a["url"] not in seen]
+# ─── Archive ─────────────────────────────────────────────────────────────────
+
+def archive_run(fresh: list[dict], summarised: list[dict]) -> None:
+    """
+    Append this run's articles to the local archive. `summarised` holds
+    copies carrying an ai_summary (top-stories mode) and is written first
+    so the summary survives the plain copy in `fresh`.
+    """
+    from archive import archive_articles
+
+    try:
+        n = archive_articles(summarised + fresh)
+        logger.info(f"Archived {n} articles.")
+    except Exception as e:
+        logger.warning(f"Archive write failed: {e}")
+
+
+def record_rollup(top_stories: list[dict]) -> None:
+    """Fold this run's Top 10 into the weekly/monthly roll-up tallies."""
+    from rollup import record_run
+
+    try:
+        n = record_run(top_stories)
+        if n:
+            logger.info(f"Recorded {n} top stories for the roll-ups.")
+    except Exception as e:
+        logger.warning(f"Roll-up write failed: {e}")
+
+
+# ─── Startup Profiling ───────────────────────────────────────────────────────
+
+def stage_modules() -> dict[str, list[str]]:
+    """
+    Modules each pipeline stage imports under the current configuration
+    (CATEGORY, RSS_STREAMING, NEWS_API_KEY, SUMMARY_ENGINE, DELIVERY_MODE),
+    in the order a run first touches them. Keep in step with the lazy
+    imports in main() and the functions it calls.
+    """
+    from config import RSS_STREAMING, NEWS_API_KEY, SUMMARY_ENGINE
+
+    top_mode = os.getenv("CATEGORY", "all").lower() == "all"
+    fetch = ["fetcher", "feed_health", "category_build", "requests"]
+    if not RSS_STREAMING:
+        fetch.append("feedparser")  # Otherwise only loaded for feeds the streaming parser rejects
+    if NEWS_API_KEY:
+        fetch.append("newsapi_client")
+
+    stages = {"fetch": fetch, "prefilter": ["relevance"]}
+    if not top_mode:
+        stages["classify"] = ["classifier"]
+    stages["summarize"] = ["summarizer"] + (["local_summarizer"] if SUMMARY_ENGINE == "local" else [])
+    stages["format"] = ["formatter"]
+    stages["send"] = ["telegram_bot"] + (["delivery"] if DELIVERY_MODE == "edit" else [])
+    # The archive tags Top 10 articles with their categories
+    stages["archive"] = ["archive"] + (["classifier"] if top_mode else []) + ["rollup"]
+    return stages
+
+
+def profile_startup() -> None:
+    """
+    Import every stage's modules the way a run would and print how long
+    each one took. Modules are cached after their first import, so each
+    timing is the incremental cost of that module on top of the ones above.
+    """
+    entry_ms = (time.perf_counter() - _T_START) * 1000
+    rows = [("(entry point)", "news_bot + imports", entry_ms)]
+    first_request_ms = None
+
+    for stage, modules in stage_modules().items():
+        for name in modules:
+            t0 = time.perf_counter()
+            importlib.import_module(name)
+            rows.append((stage, name, (time.perf_counter() - t0) * 1000))
+        if stage == "fetch":
+            first_request_ms = (time.perf_counter() - _T_START) * 1000
+
+    total_ms = (time.perf_counter() - _T_START) * 1000
+    print(f"{'stage':<14} {'module':<20} {'ms':>8}")
+    print("-" * 44)
+    for stage, name, ms in rows:
+        print(f"{stage:<14} {name:<20} {ms:>8.1f}")
+    print("-" * 44)
+    print(f"{'time to first network request':<35} {first_request_ms:>8.1f}")
+    print(f"{'all stages imported':<35} {total_ms:>8.1f}")
 
 
 # ─── Main ─────────────────────────────────────────────────────────────────────
@@ -59,15 +132,21 @@ def main() -> None:
     seen_urls = load_seen_urls()
     logger.info(f"Seen URLs loaded: {len(seen_urls)}")
 
-    # 2. Fetch
+    # Stories the breaking-news watcher already posted count as seen
+    alerted_urls, alerts = recent_alerts()
+    seen_urls |= alerted_urls
+
+    target_category = os.getenv("CATEGORY", "all").lower()
+    is_manual = os.getenv("EVENT_NAME") == "workflow_dispatch"
+
+    # 2. Fetch — scheduled runs only read entries past each feed's watermark
     logger.info("Fetching articles from all sources...")
-    all_articles = fetch_all_articles(hours=12)
+    from fetcher import fetch_all_articles, commit_watermarks
+    with stage("fetch"):
+        all_articles = fetch_all_articles(hours=12, incremental=not is_manual)
     logger.info(f"Total fetched: {len(all_articles)}")
 
     # 3. Filter already-seen articles
-    target_category = os.getenv("CATEGORY", "all").lower()
-    is_manual = os.getenv("EVENT_NAME") == "workflow_dispatch"
-    
     # If it's a manual on-demand request from Telegram, always give them the news (bypass cache)
     if is_manual:
         fresh = all_articles
@@ -75,16 +154,30 @@ def main() -> None:
     else:
         fresh = filter_seen(all_articles, seen_urls)
         logger.info(f"Automated run: Fresh articles (not seen before): {len(fresh)}")
+        from feed_health import record_useful
+        record_useful(fresh)
 
     if not fresh:
         logger.info("Nothing new to post. Exiting.")
+        commit_watermarks()
         sys.exit(0)
 
+    # Keep obvious non-AI articles out of the Gemini prompts
+    from relevance import prefilter
+    with stage("prefilter"):
+        candidates = prefilter(fresh)
+
+    from summarizer import summarize_all, summarize_top_stories
+    from formatter import format_full_digest, format_top_stories, format_summary_line
+    from telegram_bot import send_messages, send_message
+
     # 4. Branch: "All Categories" (Top 10) vs specific category
+    top_stories: list[dict] = []
     if target_category == "all":
         # ── Top 10 Mode: single consolidated message ──
         logger.info("All Categories mode: generating Top 10 AI Stories...")
-        top_stories = summarize_top_stories(fresh)
+        with stage("summarize"):
+            top_stories = summarize_top_stories(candidates)
 
         if not top_stories:
             logger.info("No AI-relevant stories found.")
@@ -92,11 +185,14 @@ def main() -> None:
                 send_message("🔍 <b>BuzzWordAI</b>\n\nNo AI-relevant news found right now.\nTry again later! 🧠")
             sys.exit(0)
 
-        messages = format_top_stories(top_stories)
+        with stage("format"):
+            messages = format_top_stories(top_stories)
 
     else:
         # ── Specific Category Mode: category-based digest ──
-        categorised = classify_all(fresh)
+        from classifier import classify_all
+        with stage("classify"):
+            categorised = classify_all(candidates)
 
         if target_category in categorised:
             logger.info(f"Filtering digest for category: {target_category}")
@@ -114,7 +210,8 @@ def main() -> None:
             sys.exit(0)
 
         logger.info("Generating AI summaries via Gemini...")
-        categorised = summarize_all(categorised)
+        with stage("summarize"):
+            categorised = summarize_all(categorised)
 
         if not any(categorised.values()):
             logger.info("All articles filtered as non-AI by Gemini.")
@@ -122,23 +219,65 @@ def main() -> None:
                 send_message("🔍 <b>BuzzWordAI</b>\n\nNo AI-relevant news found right now.\nTry another category! 🧠")
             sys.exit(0)
 
-        messages = format_full_digest(categorised)
+        with stage("format"):
+            messages = format_full_digest(categorised)
+
+    # 5. Send — or, in edit mode, update this window's digest in place
+    with stage("send"):
+        if DELIVERY_MODE == "edit" and not is_manual:
+            from delivery import update_digest, update_top_stories
+            if target_category == "all":
+                calls = update_top_stories(top_stories)
+            else:
+                calls = update_digest(categorised, kind=target_category)
+            logger.info(f"Digest updated in place: {calls} Telegram calls")
+        else:
+            sent = send_messages(messages)
+            logger.info(f"Messages sent: {sent}/{len(messages)}")
 
-    # 5. Send
-    sent = send_messages(messages)
-    logger.info(f"Messages sent: {sent}/{len(messages)}")
+    # 6. Archive everything we saw this run (with summaries where we have them),
+    #    plus the watcher's recent alerts, which never reach `fresh`
+    with stage("archive"):
+        archive_run(fresh, top_stories + alerts)
 
-    # 6. Save seen URLs
+    # 7. Save seen URLs (manual runs repeat stories, so they skip the roll-ups too)
     if not is_manual:
+        record_rollup(top_stories)
         new_urls = {a["url"] for a in fresh}
         seen_urls.update(new_urls)
         save_seen_urls(seen_urls)
         logger.info(f"Saved {len(new_urls)} new URLs to seen list.")
+        commit_watermarks()
     else:
         logger.info("Bypassed saving seen URLs for manual request.")
 
     logger.info("✅ NovaPulse run complete.")
 
 
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="NovaPulse AI digest bot")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print an import-time breakdown per pipeline stage and exit",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "mem"],
+        help="profile each pipeline stage with cProfile (cpu) or tracemalloc (mem)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="where --profile writes its per-stage reports (default: profiles/)",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = _parse_args()
+    if args.profile_startup:
+        profile_startup()
+    else:
+        configure_profiling(args.profile, args.profile_dir)
+        main()
@@ -0,0 +1,227 @@
+"""
+NovaPulse — NewsAPI Client
+Quota-aware access to the NewsAPI free tier (100 requests / 24h).
+
+  - A persistent request ledger, shared by scheduled and manual runs via
+    the workflow cache, tracks every request made in the last 24 hours.
+  - Each run gets a budget: scheduled runs leave NEWSAPI_RESERVE requests
+    untouched so on-demand runs still have quota.
+  - Queries are planned per category from the CATEGORIES keywords, one
+    request each. The free tier stops at 100 results per query, which a
+    single 100-article page already covers, so there is no paging.
+  - Responses are cached per (query, hour-aligned window), so a manual
+    run right after a scheduled one costs nothing.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from categories import CATEGORIES, CATEGORY_ORDER
+from config import (
+    NEWS_API_KEY,
+    NEWSAPI_DAILY_LIMIT,
+    NEWSAPI_RUN_BUDGET,
+    NEWSAPI_RESERVE,
+    NEWSAPI_PAGE_SIZE,
+    NEWSAPI_CACHE_TTL_MINUTES,
+    NEWSAPI_STATE_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+
+QUOTA_WINDOW = timedelta(hours=24)
+MAX_QUERY_CHARS = 500  # NewsAPI rejects longer `q` values
+
+GENERAL_QUERY = "artificial intelligence OR AI OR machine learning OR LLM OR generative AI"
+_AI_CONTEXT = '("artificial intelligence" OR AI OR "machine learning" OR LLM)'
+
+# Error codes that mean "stop spending requests"
+_QUOTA_ERRORS = {"rateLimited", "apiKeyExhausted"}
+_FATAL_ERRORS = {"apiKeyInvalid", "apiKeyDisabled", "apiKeyMissing"}
+
+
+# ─── Ledger / Cache State ────────────────────────────────────────────────────
+
+def _load_state() -> dict:
+    p = Path(NEWSAPI_STATE_FILE)
+    if p.exists():
+        try:
+            with open(p) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"NewsAPI state unreadable, starting fresh: {e}")
+    return {"requests": [], "blocked_until": None, "cache": {}}
+
+
+def _save_state(state: dict) -> None:
+    with open(NEWSAPI_STATE_FILE, "w") as f:
+        json.dump(state, f)
+
+
+def _prune(state: dict, now: datetime) -> None:
+    """Drop ledger entries older than the quota window and expired cache entries."""
+    window_start = (now - QUOTA_WINDOW).timestamp()
+    state["requests"] = [t for t in state["requests"] if t >= window_start]
+    ttl = NEWSAPI_CACHE_TTL_MINUTES * 60
+    state["cache"] = {
+        k: v for k, v in state["cache"].items() if now.timestamp() - v["stored_at"] < ttl
+    }
+    if state.get("blocked_until") and state["blocked_until"] <= now.timestamp():
+        state["blocked_until"] = None
+
+
+def remaining_quota(state: dict, now: datetime) -> int:
+    """Requests still available in the rolling 24h window."""
+    if state.get("blocked_until"):
+        return 0
+    return max(0, NEWSAPI_DAILY_LIMIT - len(state["requests"]))
+
+
+def run_budget(state: dict, now: datetime, manual: bool) -> int:
+    """How many requests this run may spend."""
+    available = remaining_quota(state, now)
+    if not manual:
+        available -= NEWSAPI_RESERVE
+    return max(0, min(NEWSAPI_RUN_BUDGET, available))
+
+
+# ─── Query Planning ──────────────────────────────────────────────────────────
+
+def _query_for(keywords: list[str]) -> str:
+    """OR together as many category keywords as fit, scoped to AI news."""
+    suffix = f" AND {_AI_CONTEXT}"
+    terms: list[str] = []
+    for kw in keywords:
+        if len(kw) <= 2:
+            continue  # "ip", "un", "ga" match far too much on their own
+        term = f'"{kw}"' if " " in kw or "-" in kw else kw
+        candidate = "(" + " OR ".join(terms + [term]) + ")" + suffix
+        if len(candidate) > MAX_QUERY_CHARS:
+            break
+        terms.append(term)
+    return "(" + " OR ".join(terms) + ")" + suffix
+
+
+def build_query_plan() -> list[tuple[str, str]]:
+    """
+    [(label, q), ...] — the broad AI query first (best coverage for a
+    single request), then one query per category in display order.
+    """
+    plan = [("general", GENERAL_QUERY)]
+    for key in CATEGORY_ORDER:
+        keywords = CATEGORIES.get(key, {}).get("keywords", [])
+        if keywords:
+            plan.append((key, _query_for(keywords)))
+    return plan
+
+
+# ─── Requests ────────────────────────────────────────────────────────────────
+
+def _to_article(item: dict) -> dict:
+    return {
+        "title": item["title"].strip(),
+        "url": item["url"],
+        "summary": (item.get("description") or "")[:300].strip(),
+        "published": datetime.fromisoformat(item["publishedAt"].replace("Z", "+00:00")),
+        "source": item.get("source", {}).get("name", "NewsAPI"),
+    }
+
+
+def _serialise(articles: list[dict]) -> list[dict]:
+    return [{**a, "published": a["published"].isoformat()} for a in articles]
+
+
+def _deserialise(articles: list[dict]) -> list[dict]:
+    return [{**a, "published": datetime.fromisoformat(a["published"])} for a in articles]
+
+
+def _request(q: str, from_dt: str) -> dict:
+    """One NewsAPI call. Returns the decoded JSON body, error or not."""
+    import requests
+
+    params = {
+        "q": q,
+        "language": "en",
+        "sortBy": "publishedAt",
+        "from": from_dt,
+        "pageSize": NEWSAPI_PAGE_SIZE,
+        "apiKey": NEWS_API_KEY,
+    }
+    resp = requests.get(NEWSAPI_URL, params=params, timeout=15)
+    try:
+        return resp.json()
+    except ValueError:
+        resp.raise_for_status()
+        raise
+
+
+def fetch_everything(hours: int = 12) -> list[dict]:
+    """
+    Run the query plan within this run's request budget and return the
+    combined, URL-deduplicated articles.
+    """
+    now = datetime.now(timezone.utc)
+    manual = os.getenv("EVENT_NAME") == "workflow_dispatch"
+    # Align the window to the hour so nearby runs share cache entries
+    window_start = (now - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+    from_dt = window_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    state = _load_state()
+    _prune(state, now)
+    budget = run_budget(state, now, manual)
+    spent = cached = 0
+
+    articles: dict[str, dict] = {}
+    try:
+        for label, q in build_query_plan():
+            key = f"{q}|{from_dt}"
+
+            entry = state["cache"].get(key)
+            if entry:
+                cached += 1
+            else:
+                if spent >= budget:
+                    continue  # out of budget, but later queries may still be cached
+                state["requests"].append(now.timestamp())
+                spent += 1
+                try:
+                    data = _request(q, from_dt)
+                except Exception as e:
+                    # Keep what earlier requests returned; the quota is already spent
+                    logger.warning(f"NewsAPI [{label}] request failed: {e}")
+                    continue
+                if data.get("status") != "ok":
+                    code = data.get("code", "unknown")
+                    if code in _QUOTA_ERRORS:
+                        oldest = min(state["requests"])
+                        state["blocked_until"] = oldest + QUOTA_WINDOW.total_seconds()
+                        logger.warning(f"NewsAPI quota exhausted ({code}): {data.get('message')}")
+                        break
+                    if code in _FATAL_ERRORS:
+                        logger.error(f"NewsAPI rejected the API key ({code}): {data.get('message')}")
+                        break
+                    logger.warning(f"NewsAPI [{label}] error {code}: {data.get('message')}")
+                    continue
+                items = [i for i in data.get("articles", []) if i.get("url") and i.get("title")]
+                entry = {
+                    "stored_at": now.timestamp(),
+                    "total": data.get("totalResults", 0),
+                    "articles": _serialise([_to_article(i) for i in items]),
+                }
+                state["cache"][key] = entry
+
+            for a in _deserialise(entry["articles"]):
+                articles.setdefault(a["url"], a)
+    finally:
+        _save_state(state)
+
+    logger.info(
+        f"NewsAPI: {len(articles)} articles from {spent} requests "
+        f"({cached} cached, budget {budget}, {remaining_quota(state, now)} left today)"
+    )
+    return list(articles.values())
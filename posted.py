@@ -0,0 +1,77 @@
+"""
+NovaPulse — Posted-Story State
+What has already gone out, shared by the digest (news_bot.py), the
+breaking-news watcher (breaking.py) and the multi-tenant runner:
+
+  - seen URLs (SEEN_URLS_FILE, or a tenant's own file): every article a
+    digest has covered, so later runs skip it
+  - breaking-news state (BREAKING_STATE_FILE): the watcher's recent alerts
+    and its cached coverage fetch; the digest reads the alerts so it
+    doesn't repeat a story the watcher already posted
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from config import SEEN_URLS_FILE, MAX_SEEN_URLS, BREAKING_STATE_FILE
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Deduplication ───────────────────────────────────────────────────────────
+
+def load_seen_urls(path: str = SEEN_URLS_FILE) -> set[str]:
+    p = Path(path)
+    if p.exists():
+        with open(p) as f:
+            return set(json.load(f))
+    return set()
+
+
+def save_seen_urls(seen: set[str], path: str = SEEN_URLS_FILE) -> None:
+    # Keep only the last MAX_SEEN_URLS to avoid the file growing forever
+    trimmed = list(seen)[-MAX_SEEN_URLS:]
+    with open(path, "w") as f:
+        json.dump(trimmed, f)
+
+
+def filter_seen(articles: list[dict], seen: set[str]) -> list[dict]:
+    return [a for a in articles if a["url"] not in seen]
+
+
+# ─── Breaking-News State ─────────────────────────────────────────────────────
+
+def load_breaking_state(path: str = BREAKING_STATE_FILE) -> dict:
+    p = Path(path)
+    if p.exists():
+        try:
+            with open(p) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Breaking-news state unreadable, starting fresh: {e}")
+    return {}
+
+
+def save_breaking_state(state: dict, path: str = BREAKING_STATE_FILE) -> None:
+    with open(path, "w") as f:
+        json.dump(state, f)
+
+
+def serialise_article(article: dict) -> dict:
+    return {**article, "published": article["published"].isoformat()}
+
+
+def deserialise_article(article: dict) -> dict:
+    return {**article, "published": datetime.fromisoformat(article["published"])}
+
+
+def recent_alerts(path: str = BREAKING_STATE_FILE) -> tuple[set[str], list[dict]]:
+    """
+    (story URLs, alert articles) the breaking-news watcher posted and still
+    keeps — for the digest's dedup and archive.
+    """
+    alerts = load_breaking_state(path).get("alerts", [])
+    urls = {u for alert in alerts for u in alert["urls"]}
+    return urls, [deserialise_article(alert["article"]) for alert in alerts]
@@ -0,0 +1,124 @@
+"""
+NovaPulse — Stage Profiling
+Per-stage CPU and memory profiles for a pipeline run, switched on from
+the command line (`python news_bot.py --profile cpu|mem`):
+
+  - cpu: each stage runs under cProfile. Its raw stats go to
+    NN-<stage>.pstats (open with `python -m pstats` or snakeviz), and the
+    top functions by cumulative time go to NN-<stage>.txt.
+  - mem: tracemalloc snapshots taken before and after each stage. The
+    biggest allocation growth by source line goes to NN-<stage>.mem.txt,
+    along with the stage's peak traced memory.
+
+Every stage also appends its wall time (and peak, for mem) to summary.txt.
+When profiling is off, stage() only checks one flag, so the wrappers can
+stay in place in production runs.
+
+Feeds fetched in the RSS_WORKERS process pool run outside the profiler;
+use RSS_WORKERS=1 to profile feed parsing in-process.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MODES = ("cpu", "mem")
+TOP_N = 40  # Rows per stage report
+
+_mode: str | None = None
+_out_dir: Path | None = None
+_count = 0
+
+
+def configure(mode: str | None, out_dir: str = "profiles") -> None:
+    """Turn profiling on (mode "cpu" or "mem") or off (None)."""
+    global _mode, _out_dir, _count
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Unknown profile mode {mode!r}; expected one of {MODES}")
+    _mode, _count = mode, 0
+    if mode is None:
+        return
+
+    _out_dir = Path(out_dir)
+    _out_dir.mkdir(parents=True, exist_ok=True)
+    (_out_dir / "summary.txt").write_text(f"{'stage':<20} {'seconds':>9} {'peak MB':>9}\n")
+    if mode == "mem":
+        import tracemalloc
+        tracemalloc.start(10)  # Frames per allocation, so reports show callers too
+    logger.info(f"Profiling ({mode}) every stage into {_out_dir}/")
+
+
+@contextmanager
+def stage(name: str):
+    """Profile the enclosed block as one pipeline stage (no-op when off)."""
+    if _mode is None:
+        yield
+        return
+
+    global _count
+    _count += 1
+    prefix = _out_dir / f"{_count:02d}-{name}"
+    profiler = _cpu(prefix) if _mode == "cpu" else _mem(prefix)
+    result: dict = {}
+    elapsed = 0.0
+    try:
+        with profiler as result:
+            t0 = time.perf_counter()  # Inside the profiler, so snapshots don't count
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - t0
+    finally:
+        # Also reached when a stage ends the run early (sys.exit)
+        peak = result.get("peak")
+        peak_text = f"{peak / 1e6:>9.1f}" if peak is not None else f"{'-':>9}"
+        with open(_out_dir / "summary.txt", "a") as f:
+            f.write(f"{name:<20} {elapsed:>9.3f} {peak_text}\n")
+        logger.info(f"Profiled stage {name}: {elapsed:.2f}s → {prefix}.*")
+
+
+# ─── CPU ─────────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _cpu(prefix: Path):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield {}
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{prefix}.pstats")
+        with open(f"{prefix}.txt", "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(TOP_N)
+
+
+# ─── Memory ──────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _mem(prefix: Path):
+    import tracemalloc
+
+    result = {"peak": 0}
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot().filter_traces(ignore)
+    try:
+        yield result
+    finally:
+        result["peak"] = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        diff = after.compare_to(before, "lineno")
+        with open(f"{prefix}.mem.txt", "w") as f:
+            f.write(f"Peak traced memory: {result['peak'] / 1e6:.1f} MB\n")
+            f.write(f"Top {TOP_N} allocation changes by line:\n\n")
+            for entry in diff[:TOP_N]:
+                f.write(f"{entry}\n")
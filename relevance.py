@@ -0,0 +1,239 @@
+"""
+NovaPulse — AI-Relevance Prefilter
+A small local model that rejects obviously non-AI articles before they
+take up prompt slots that Gemini would only answer with "SKIP".
+
+The model is a logistic regression over hashed word unigrams + bigrams of
+title + description, trained on Gemini's own keep/SKIP verdicts from the
+archive. Until a model has been trained, prefilter() lets everything through.
+Scheduled (Top 10) runs only record keeps, so SKIPs come from category
+runs; training waits until both classes have RELEVANCE_MIN_PER_CLASS
+verdicts rather than fitting a model to a handful of up-weighted SKIPs.
+
+Every verdict is recorded in the archive's `verdicts` table:
+  - "gemini"    — label 1 (kept) / 0 (SKIP) from summarize_category,
+                  label 1 for stories picked by summarize_top_stories
+  - "prefilter" — the local score and threshold decision (no label, so
+                  rejected articles never feed back into training)
+
+Usage:
+    python relevance.py train   # Retrain from archived Gemini verdicts
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import re
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import (
+    RELEVANCE_MODEL_FILE,
+    RELEVANCE_THRESHOLD,
+    RELEVANCE_MIN_TRAINING,
+    RELEVANCE_MIN_PER_CLASS,
+)
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 20
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_model: dict | None = None
+
+
+# ─── Features ────────────────────────────────────────────────────────────────
+
+def _text(article: dict) -> str:
+    return f"{article.get('title', '')} {article.get('summary', '')}"
+
+
+def _features(text: str) -> list[int]:
+    """Hashed unigram + bigram buckets (crc32, so stable across processes)."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    mask = (1 << HASH_BITS) - 1
+    return sorted({zlib.crc32(g.encode()) & mask for g in grams})
+
+
+def _sigmoid(z: float) -> float:
+    if z < -30:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def _predict(model: dict, feats: list[int]) -> float:
+    if not feats:
+        return _sigmoid(model["bias"])
+    w = model["weights"]
+    scale = 1.0 / math.sqrt(len(feats))
+    return _sigmoid(model["bias"] + scale * sum(w.get(f, 0.0) for f in feats))
+
+
+# ─── Model I/O ───────────────────────────────────────────────────────────────
+
+def load_model() -> dict | None:
+    """The trained model, or None if nothing usable has been trained yet."""
+    global _model
+    if _model is None:
+        p = Path(RELEVANCE_MODEL_FILE)
+        if not p.exists():
+            return None
+        try:
+            with open(p) as f:
+                raw = json.load(f)
+            raw["weights"] = {int(k): v for k, v in raw["weights"].items()}
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Relevance model unreadable, prefilter disabled: {e}")
+            return None
+        _model = raw
+    return _model
+
+
+def save_model(model: dict) -> None:
+    out = {**model, "weights": {str(k): round(v, 5) for k, v in model["weights"].items()}}
+    # Write-then-rename so a run never loads a half-written model
+    tmp = f"{RELEVANCE_MODEL_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(out, f)
+    os.replace(tmp, RELEVANCE_MODEL_FILE)
+
+
+def score(article: dict) -> float | None:
+    """P(AI-relevant) for one article, or None without a trained model."""
+    model = load_model()
+    if model is None:
+        return None
+    return _predict(model, _features(_text(article)))
+
+
+# ─── Prefilter ───────────────────────────────────────────────────────────────
+
+def prefilter(articles: list[dict], threshold: float = RELEVANCE_THRESHOLD) -> list[dict]:
+    """
+    Drop articles scoring below `threshold` before any prompt is built.
+    Every decision is recorded so the model can be audited and retrained.
+    """
+    model = load_model()
+    if model is None or not articles:
+        return articles
+
+    kept, verdicts = [], []
+    for a in articles:
+        p = _predict(model, _features(_text(a)))
+        verdicts.append((a["url"], _text(a), "prefilter", None, p))
+        if p >= threshold:
+            kept.append(a)
+
+    _record(verdicts)
+    logger.info(f"Relevance prefilter: kept {len(kept)}/{len(articles)} (threshold {threshold})")
+    return kept
+
+
+def record_gemini_verdicts(articles: list[dict], kept: list[bool]) -> None:
+    """Store Gemini's keep (1) / SKIP (0) decision for each article."""
+    _record([
+        (a["url"], _text(a), "gemini", int(k), None)
+        for a, k in zip(articles, kept)
+    ])
+
+
+def _record(rows: list[tuple]) -> None:
+    from archive import record_verdicts
+
+    try:
+        record_verdicts(rows)
+    except Exception as e:
+        logger.warning(f"Could not record relevance verdicts: {e}")
+
+
+# ─── Training ────────────────────────────────────────────────────────────────
+
+def train(
+    samples: list[tuple[str, int]],
+    epochs: int = 8,
+    lr: float = 0.2,
+    l2: float = 1e-5,
+) -> dict:
+    """
+    Plain SGD logistic regression. Positives and negatives are weighted
+    so each class contributes equally — Gemini keeps far more than it skips.
+    """
+    data = [(_features(text), label) for text, label in samples]
+    n_pos = sum(label for _, label in data) or 1
+    n_neg = (len(data) - n_pos) or 1
+    class_weight = {1: len(data) / (2 * n_pos), 0: len(data) / (2 * n_neg)}
+
+    model = {"bias": 0.0, "weights": {}}
+    w = model["weights"]
+    rng = random.Random(0)
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        step = lr / (1 + epoch)
+        for feats, label in data:
+            grad = (_predict(model, feats) - label) * class_weight[label]
+            scale = 1.0 / math.sqrt(len(feats)) if feats else 0.0
+            model["bias"] -= step * grad
+            for f in feats:
+                w[f] = w.get(f, 0.0) * (1 - step * l2) - step * grad * scale
+
+    model["hash_bits"] = HASH_BITS
+    model["trained_on"] = len(data)
+    model["trained_at"] = datetime.now(timezone.utc).isoformat()
+    return model
+
+
+def _evaluate(model: dict, samples: list[tuple[str, int]], threshold: float) -> str:
+    tp = fp = tn = fn = 0
+    for text, label in samples:
+        keep = _predict(model, _features(text)) >= threshold
+        if keep and label:
+            tp += 1
+        elif keep:
+            fp += 1
+        elif label:
+            fn += 1
+        else:
+            tn += 1
+    return (
+        f"rejected {tn}/{tn + fp} non-AI, wrongly rejected {fn}/{tp + fn} AI "
+        f"at threshold {threshold}"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Train the NovaPulse relevance prefilter")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--threshold", type=float, default=RELEVANCE_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    from archive import labelled_verdicts
+
+    samples = labelled_verdicts()
+    n_pos = sum(label for _, label in samples)
+    n_neg = len(samples) - n_pos
+    if len(samples) < RELEVANCE_MIN_TRAINING or min(n_pos, n_neg) < RELEVANCE_MIN_PER_CLASS:
+        logger.info(
+            f"Only {n_pos} keep / {n_neg} SKIP verdicts (need {RELEVANCE_MIN_TRAINING} in total, "
+            f"{RELEVANCE_MIN_PER_CLASS} of each) — not training yet."
+        )
+        return
+
+    random.Random(1).shuffle(samples)
+    split = int(len(samples) * 0.8)
+    holdout = train(samples[:split], epochs=args.epochs)
+    logger.info(f"Holdout: {_evaluate(holdout, samples[split:], args.threshold)}")
+
+    model = train(samples, epochs=args.epochs)
+    save_model(model)
+    logger.info(f"Saved {RELEVANCE_MODEL_FILE}: {len(model['weights'])} weights from {len(samples)} verdicts")
+
+
+if __name__ == "__main__":
+    main()
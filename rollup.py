@@ -0,0 +1,214 @@
+"""
+NovaPulse — Weekly / Monthly Roll-ups
+Builds "biggest AI stories of the week/month" digests from what past runs
+already ranked, so nothing is refetched and nothing goes back to Gemini.
+
+Every automated run folds its Top 10 into running tallies in archive.db,
+one row per (period, url) for the current ISO week and calendar month:
+  - runs:        how many runs ranked the story
+  - score:       sum of per-run points (rank position + coverage)
+  - best_rank / max_cluster, and the latest AI summary
+Building a roll-up reads one period's tallies, merges rows that cover the
+same story under different URLs, and formats them with format_top_stories.
+
+Usage:
+    python rollup.py week                    # Last complete ISO week
+    python rollup.py month --period 2026-10  # A specific month
+    python rollup.py week --current --send   # Week so far, post to Telegram
+"""
+
+import argparse
+import logging
+import math
+from datetime import datetime, timezone, timedelta
+
+from config import ARCHIVE_FILE
+
+logger = logging.getLogger(__name__)
+
+TOP_N = 10
+CANDIDATE_POOL = 50  # Highest-scoring rows considered when merging same-story URLs
+
+
+# ─── Periods ─────────────────────────────────────────────────────────────────
+
+def week_key(when: datetime) -> str:
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(when: datetime) -> str:
+    return when.strftime("%Y-%m")
+
+
+def previous_period(kind: str, now: datetime | None = None) -> str:
+    """Key of the last complete week or month before `now`."""
+    now = now or datetime.now(timezone.utc)
+    if kind == "week":
+        return week_key(now - timedelta(days=7))
+    return month_key(now.replace(day=1) - timedelta(days=1))
+
+
+def _dateline(period: str) -> str:
+    if "-W" in period:
+        year, week = period.split("-W")
+        monday = datetime.fromisocalendar(int(year), int(week), 1)
+        sunday = monday + timedelta(days=6)
+        return f"Week of {monday.strftime('%d %b')} – {sunday.strftime('%d %b %Y')}"
+    return datetime.strptime(period, "%Y-%m").strftime("%B %Y")
+
+
+# ─── Recording ───────────────────────────────────────────────────────────────
+
+_UPSERT = """
+INSERT INTO rollup_stories
+    (period, url, title, source, ai_summary, runs, best_rank, max_cluster, score, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT(period, url) DO UPDATE SET
+    title       = excluded.title,
+    ai_summary  = COALESCE(excluded.ai_summary, rollup_stories.ai_summary),
+    runs        = rollup_stories.runs + 1,
+    best_rank   = MIN(rollup_stories.best_rank, excluded.best_rank),
+    max_cluster = MAX(rollup_stories.max_cluster, excluded.max_cluster),
+    score       = rollup_stories.score + excluded.score,
+    last_seen   = excluded.last_seen
+"""
+
+
+def _points(rank: int, cluster_size: int) -> float:
+    """One run's credit: #1 earns 1.0 down to 0.1 for #10, plus coverage."""
+    return (TOP_N + 1 - min(rank, TOP_N)) / TOP_N + math.log1p(cluster_size)
+
+
+def record_run(top_stories: list[dict], now: datetime | None = None, path: str = ARCHIVE_FILE) -> int:
+    """
+    Fold one run's ranked top stories into the current week's and month's
+    tallies. Returns the number of stories recorded.
+    """
+    if not top_stories:
+        return 0
+
+    from archive import connect
+
+    now = now or datetime.now(timezone.utc)
+    ts = now.timestamp()
+    rows = []
+    for rank, a in enumerate(top_stories[:TOP_N], 1):
+        size = a.get("cluster_size") or 1
+        for period in (week_key(now), month_key(now)):
+            rows.append((
+                period,
+                a["url"],
+                a.get("title", ""),
+                a.get("source", ""),
+                a.get("ai_summary") or None,
+                rank,
+                size,
+                _points(rank, size),
+                ts,
+                ts,
+            ))
+    conn = connect(path)
+    try:
+        with conn:
+            conn.executemany(_UPSERT, rows)
+    finally:
+        conn.close()
+    return len(rows) // 2
+
+
+# ─── Building ────────────────────────────────────────────────────────────────
+
+def top_stories(period: str, n: int = TOP_N, path: str = ARCHIVE_FILE) -> list[dict]:
+    """
+    The period's biggest stories, best first. Rows whose titles cluster as
+    the same story (picked up from different sources on different runs)
+    are merged: their scores add up and the best-scoring row leads.
+    """
+    from archive import connect
+    from local_summarizer import cluster
+
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT * FROM rollup_stories WHERE period = ? ORDER BY score DESC LIMIT ?",
+            (period, CANDIDATE_POOL),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    stories = [
+        {
+            "title": r["title"],
+            "url": r["url"],
+            "source": r["source"] or "",
+            "ai_summary": r["ai_summary"] or "",
+            "runs": r["runs"],
+            "score": r["score"],
+            "cluster_size": r["max_cluster"],
+        }
+        for r in rows
+    ]
+    merged = []
+    for members in cluster(stories):
+        lead = dict(members[0])  # Rows arrive best-first, so the lead has the top score
+        lead["score"] = sum(m["score"] for m in members)
+        lead["runs"] = sum(m["runs"] for m in members)
+        lead["cluster_size"] = max(m["cluster_size"] for m in members)
+        if not lead["ai_summary"]:
+            lead["ai_summary"] = next((m["ai_summary"] for m in members if m["ai_summary"]), "")
+        merged.append(lead)
+
+    merged.sort(key=lambda s: s["score"], reverse=True)
+    return merged[:n]
+
+
+def build(period: str, brand: str | None = None, path: str = ARCHIVE_FILE) -> list[str]:
+    """Roll-up messages for a period key ("2026-W42" or "2026-10")."""
+    from formatter import BRAND, format_top_stories
+
+    stories = top_stories(period, path=path)
+    if not stories:
+        return []
+    heading = "AI Stories of the Week" if "-W" in period else "AI Stories of the Month"
+    return format_top_stories(stories, brand=brand or BRAND, heading=heading, dateline=_dateline(period))
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Build NovaPulse weekly/monthly roll-ups")
+    parser.add_argument("kind", choices=["week", "month"])
+    parser.add_argument("--period", help="YYYY-Www or YYYY-MM (default: last complete one)")
+    parser.add_argument("--current", action="store_true", help="use the period in progress")
+    parser.add_argument("--send", action="store_true", help="post to Telegram instead of printing")
+    args = parser.parse_args(argv)
+
+    now = datetime.now(timezone.utc)
+    if args.period:
+        period = args.period
+    elif args.current:
+        period = week_key(now) if args.kind == "week" else month_key(now)
+    else:
+        period = previous_period(args.kind, now)
+
+    messages = build(period)
+    if not messages:
+        logger.info(f"No recorded runs for {period}.")
+        return
+
+    if args.send:
+        from telegram_bot import send_messages
+        sent = send_messages(messages)
+        logger.info(f"Roll-up {period}: sent {sent}/{len(messages)} messages")
+    else:
+        for msg in messages:
+            print("=" * 60)
+            print(msg)
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
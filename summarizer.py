@@ -2,79 +2,81 @@
 NovaPulse — AI Summarizer
 Uses Google Gemini 2.0 Flash (free tier) to generate professional
 bullet-point summaries for each article category.
+
+Engines (SUMMARY_ENGINE):
+  - "gemini": Gemini only; failures return articles without summaries
+  - "local":  the CPU-only extractive engine in local_summarizer.py
+  - "auto":   Gemini, switching to the local engine for the rest of the
+              run once quota is exhausted or SUMMARY_TIME_BUDGET_SECONDS
+              runs out, so a run never stalls on back-off
 """
 
 import json
 import logging
-import requests
-from config import GEMINI_API_KEY, MAX_ARTICLES_PER_CATEGORY
+import time
+from config import (
+    GEMINI_API_KEY,
+    MAX_ARTICLES_PER_CATEGORY,
+    SUMMARY_ENGINE,
+    SUMMARY_TIME_BUDGET_SECONDS,
+)
 from categories import CATEGORIES
 
 logger = logging.getLogger(__name__)
 
 GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
 
-# ─── Prompt Template ─────────────────────────────────────────────────────────
+# ─── Engine Selection ────────────────────────────────────────────────────────
 
-SUMMARY_PROMPT = """You are an expert AI/tech news analyst writing a WhatsApp-friendly news digest.
+_budget_started: float | None = None  # perf_counter() of the run's first summarization call
+_gemini_exhausted = False             # Sticky for the rest of the run
 
-I will give you a list of article titles and their RSS descriptions from the "{category}" category.
 
-IMPORTANT: This digest is EXCLUSIVELY about Artificial Intelligence, Machine Learning, and related technology. 
-If an article is NOT related to AI, ML, LLMs, neural networks, automation, robotics, or tech industry AI developments, set its summary to "SKIP".
-
-For each AI-relevant article, write a concise, punchy 1-2 line bullet-point summary that:
-- Captures the KEY facts (who, what, numbers, impact)
-- Is written in professional news style (no fluff, no opinions)
-- Can be understood without clicking the link
-- Uses plain text (no markdown, no HTML, no bold/italic)
+def _budget_left() -> float:
+    """Seconds of the run's summarization budget still available."""
+    global _budget_started
+    if _budget_started is None:
+        _budget_started = time.perf_counter()
+    return SUMMARY_TIME_BUDGET_SECONDS - (time.perf_counter() - _budget_started)
 
-Respond ONLY with a valid JSON array of objects, one per article, in this exact format:
-[
-  {{"index": 0, "summary": "Your 1-2 line summary here"}},
-  {{"index": 1, "summary": "SKIP"}}
-]
 
-Do NOT include anything outside the JSON array. No explanation, no preamble.
+def reset_budget() -> None:
+    """Start a new time budget and give Gemini another chance (long-running callers)."""
+    global _budget_started, _gemini_exhausted
+    _budget_started = None
+    _gemini_exhausted = False
 
-Here are the articles:
 
-{articles}"""
+def _use_local() -> bool:
+    if SUMMARY_ENGINE == "local":
+        return True
+    if SUMMARY_ENGINE == "gemini":
+        return False
+    return not GEMINI_API_KEY or _gemini_exhausted or _budget_left() <= 0
 
 
-def _build_article_text(articles: list[dict]) -> str:
-    """Format articles for the prompt."""
-    lines = []
-    for i, a in enumerate(articles[:MAX_ARTICLES_PER_CATEGORY]):
-        title = a.get("title", "No title")
-        summary = a.get("summary", "")
-        source = a.get("source", "")
-        lines.append(f"[{i}] Title: {title}\n    Description: {summary}\n    Source: {source}")
-    return "\n\n".join(lines)
+def _give_up_on_gemini(reason: str) -> None:
+    global _gemini_exhausted
+    if SUMMARY_ENGINE == "auto" and not _gemini_exhausted:
+        logger.warning(f"  Switching to local summarizer for the rest of this run: {reason}")
+    _gemini_exhausted = True
 
 
-def summarize_category(cat_key: str, articles: list[dict]) -> list[dict]:
+def _call_gemini(prompt: str, label: str, parse):
     """
-    Summarize a list of articles for a given category using Gemini.
-    Returns the articles list with a new 'ai_summary' field added to each.
-    Falls back gracefully if Gemini fails.
+    POST a prompt to Gemini and return parse(response_text), retrying up to
+    three times. Back-off never sleeps past the time budget: in auto mode
+    an exhausted budget or repeated rate limiting ends Gemini for the run.
+    Returns None when Gemini could not produce a usable answer.
     """
-    if not GEMINI_API_KEY:
-        logger.warning("GEMINI_API_KEY not set — skipping AI summaries.")
-        return articles
-
-    capped = articles[:MAX_ARTICLES_PER_CATEGORY]
-    if not capped:
-        return articles
+    import requests
 
-    cat_title = CATEGORIES.get(cat_key, {}).get("title", cat_key)
-    article_text = _build_article_text(capped)
-    prompt = SUMMARY_PROMPT.format(category=cat_title, articles=article_text)
-
-    import time
     max_retries = 3
-
     for attempt in range(max_retries):
+        left = _budget_left()
+        if SUMMARY_ENGINE == "auto" and left <= 0:
+            _give_up_on_gemini("time budget spent")
+            return None
         try:
             resp = requests.post(
                 GEMINI_URL,
@@ -90,12 +92,19 @@ def summarize_category(cat_key: str, articles: list[dict]) -> list[dict]:
                         "responseMimeType": "application/json",
                     },
                 },
-                timeout=60,
+                timeout=max(5, min(60, left)) if SUMMARY_ENGINE == "auto" else 60,
             )
 
             if resp.status_code == 429:
                 wait_time = 10 * (2 ** attempt)  # 10s, 20s, 40s
-                logger.warning(f"  Gemini rate limited for [{cat_key}], retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                if attempt == max_retries - 1:
+                    _give_up_on_gemini("rate limited")
+                    logger.warning(f"  Gemini rate limited for {label} after {max_retries} attempts")
+                    return None
+                if SUMMARY_ENGINE == "auto" and wait_time >= _budget_left():
+                    _give_up_on_gemini(f"rate limited, {wait_time}s back-off exceeds budget")
+                    return None
+                logger.warning(f"  Gemini rate limited for {label}, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
 
@@ -104,7 +113,7 @@ def summarize_category(cat_key: str, articles: list[dict]) -> list[dict]:
 
             # Extract the text response
             raw_text = data["candidates"][0]["content"]["parts"][0]["text"]
-            
+
             # Clean up: strip markdown code fences if present
             cleaned = raw_text.strip()
             if cleaned.startswith("```"):
@@ -113,29 +122,122 @@ def summarize_category(cat_key: str, articles: list[dict]) -> list[dict]:
                     cleaned = cleaned[:-3]
                 cleaned = cleaned.strip()
 
-            summaries = json.loads(cleaned)
-
-            # Attach summaries to articles, filtering out non-AI ones
-            summary_map = {s["index"]: s["summary"] for s in summaries}
-            result = []
-            skipped = 0
-            for i, article in enumerate(capped):
-                s = summary_map.get(i, "")
-                if s.upper() == "SKIP":
-                    skipped += 1
-                    continue
-                article["ai_summary"] = s
-                result.append(article)
-
-            logger.info(f"  Gemini summarized {len(result)} articles for [{cat_key}] (skipped {skipped} non-AI)")
-            return result
+            return parse(cleaned)
 
         except Exception as e:
             if attempt < max_retries - 1:
-                logger.warning(f"  Gemini attempt {attempt + 1} failed for [{cat_key}]: {e}")
-                time.sleep(5)
+                logger.warning(f"  Gemini attempt {attempt + 1} failed for {label}: {e}")
+                time.sleep(min(5, max(0, _budget_left())))
             else:
-                logger.warning(f"  Gemini summarization failed for [{cat_key}] after {max_retries} attempts: {e}")
+                logger.warning(f"  Gemini failed for {label} after {max_retries} attempts: {e}")
+    return None
+
+
+# ─── Prompt Template ─────────────────────────────────────────────────────────
+
+SUMMARY_PROMPT = """You are an expert AI/tech news analyst writing a WhatsApp-friendly news digest.
+
+I will give you a list of article titles and their RSS descriptions from the "{category}" category.
+
+IMPORTANT: This digest is EXCLUSIVELY about Artificial Intelligence, Machine Learning, and related technology. 
+If an article is NOT related to AI, ML, LLMs, neural networks, automation, robotics, or tech industry AI developments, set its summary to "SKIP".
+
+For each AI-relevant article, write a concise, punchy 1-2 line bullet-point summary that:
+- Captures the KEY facts (who, what, numbers, impact)
+- Is written in professional news style (no fluff, no opinions)
+- Can be understood without clicking the link
+- Uses plain text (no markdown, no HTML, no bold/italic)
+
+Respond ONLY with a valid JSON array of objects, one per article, in this exact format:
+[
+  {{"index": 0, "summary": "Your 1-2 line summary here"}},
+  {{"index": 1, "summary": "SKIP"}}
+]
+
+Do NOT include anything outside the JSON array. No explanation, no preamble.
+
+Here are the articles:
+
+{articles}"""
+
+
+def _build_article_text(articles: list[dict]) -> str:
+    """Format articles for the prompt."""
+    lines = []
+    for i, a in enumerate(articles):
+        title = a.get("title", "No title")
+        summary = a.get("summary", "")
+        source = a.get("source", "")
+        lines.append(f"[{i}] Title: {title}\n    Description: {summary}\n    Source: {source}")
+    return "\n\n".join(lines)
+
+
+def summarize_category(
+    cat_key: str,
+    articles: list[dict],
+    cat_title: str | None = None,
+    max_articles: int = MAX_ARTICLES_PER_CATEGORY,
+) -> list[dict]:
+    """
+    Summarize a list of articles for a given category using Gemini.
+    Returns the articles list with a new 'ai_summary' field added to each.
+    `cat_title` and `max_articles` cover tenant configs (categories that
+    aren't in CATEGORIES, per-tenant caps).
+    Falls back to the local engine (or no summaries in "gemini" mode).
+    """
+    capped = articles[:max_articles]
+    if not capped:
+        return articles
+
+    if _use_local():
+        from local_summarizer import summarize_category_local
+        if not GEMINI_API_KEY and SUMMARY_ENGINE == "auto":
+            logger.warning("GEMINI_API_KEY not set — using local summaries.")
+        result = summarize_category_local(cat_key, articles, max_articles)
+        logger.info(f"  Local engine summarized {len(result)} articles for [{cat_key}]")
+        return result
+
+    if not GEMINI_API_KEY:
+        logger.warning("GEMINI_API_KEY not set — skipping AI summaries.")
+        return articles
+
+    cat_title = cat_title or CATEGORIES.get(cat_key, {}).get("title", cat_key)
+    article_text = _build_article_text(capped)
+    prompt = SUMMARY_PROMPT.format(category=cat_title, articles=article_text)
+
+    def parse(cleaned: str) -> list[dict]:
+        summaries = json.loads(cleaned)
+
+        # Attach summaries to articles, filtering out non-AI ones
+        summary_map = {s["index"]: s["summary"] for s in summaries}
+        result = []
+        skipped = 0
+        for i, article in enumerate(capped):
+            s = summary_map.get(i, "")
+            if s.upper() == "SKIP":
+                skipped += 1
+                continue
+            article["ai_summary"] = s
+            result.append(article)
+
+        from relevance import record_gemini_verdicts
+        answered = [i for i in range(len(capped)) if i in summary_map]
+        record_gemini_verdicts(
+            [capped[i] for i in answered],
+            [summary_map[i].upper() != "SKIP" for i in answered],
+        )
+
+        logger.info(f"  Gemini summarized {len(result)} articles for [{cat_key}] (skipped {skipped} non-AI)")
+        return result
+
+    result = _call_gemini(prompt, f"[{cat_key}]", parse)
+    if result is not None:
+        return result
+
+    if SUMMARY_ENGINE == "auto":
+        from local_summarizer import summarize_category_local
+        logger.info(f"  Local engine fallback for [{cat_key}]")
+        return summarize_category_local(cat_key, capped, max_articles)
 
     # Graceful fallback: return articles without summaries
     return capped
@@ -145,14 +247,13 @@ def summarize_all(categorised: dict[str, list[dict]]) -> dict[str, list[dict]]:
     """
     Summarize all categories. Returns the same dict but with
     'ai_summary' field added to each article where possible.
-    Adds delays between categories to respect Gemini rate limits.
+    Adds delays between Gemini calls to respect rate limits.
     """
-    import time
     result = {}
     cats_processed = 0
     for cat_key, articles in categorised.items():
         if articles:
-            if cats_processed > 0:
+            if cats_processed > 0 and not _use_local():
                 time.sleep(5)  # 5s between categories to avoid rate limiting
             result[cat_key] = summarize_category(cat_key, articles)
             cats_processed += 1
@@ -193,15 +294,21 @@ def summarize_top_stories(articles: list[dict]) -> list[dict]:
     For "All Categories" mode: pick the top 10 most important AI stories
     from ALL articles and return them as a flat list with AI summaries.
     """
-    import time
+    if not articles:
+        return []
+
+    if _use_local():
+        from local_summarizer import rank_top_stories_local
+        if not GEMINI_API_KEY and SUMMARY_ENGINE == "auto":
+            logger.warning("GEMINI_API_KEY not set — ranking top stories locally.")
+        result = rank_top_stories_local(articles)
+        logger.info(f"  Local engine ranked top {len(result)} stories from {len(articles)} articles")
+        return result
 
     if not GEMINI_API_KEY:
         logger.warning("GEMINI_API_KEY not set — skipping AI summaries.")
         return articles[:10]
 
-    if not articles:
-        return []
-
     # Build prompt with up to 30 articles for Gemini to pick the top 10 from
     capped = articles[:30]
     lines = []
@@ -213,63 +320,33 @@ def summarize_top_stories(articles: list[dict]) -> list[dict]:
     article_text = "\n\n".join(lines)
     prompt = TOP_STORIES_PROMPT.format(articles=article_text)
 
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            resp = requests.post(
-                GEMINI_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-goog-api-key": GEMINI_API_KEY,
-                },
-                json={
-                    "contents": [{"parts": [{"text": prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.3,
-                        "maxOutputTokens": 4096,
-                        "responseMimeType": "application/json",
-                    },
-                },
-                timeout=60,
-            )
-
-            if resp.status_code == 429:
-                wait_time = 10 * (2 ** attempt)
-                logger.warning(f"  Gemini rate limited for top stories, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-                continue
-
-            resp.raise_for_status()
-            data = resp.json()
-            raw_text = data["candidates"][0]["content"]["parts"][0]["text"]
+    def parse(cleaned: str) -> list[dict]:
+        ranked = json.loads(cleaned)
 
-            cleaned = raw_text.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-                if cleaned.endswith("```"):
-                    cleaned = cleaned[:-3]
-                cleaned = cleaned.strip()
+        # Build result list in Gemini's ranked order
+        result = []
+        for item in ranked[:10]:
+            idx = item["index"]
+            if 0 <= idx < len(capped):
+                article = capped[idx].copy()
+                article["ai_summary"] = item["summary"]
+                result.append(article)
 
-            ranked = json.loads(cleaned)
+        # Picked stories are AI-relevant; unpicked ones may just be less important
+        from relevance import record_gemini_verdicts
+        record_gemini_verdicts(result, [True] * len(result))
 
-            # Build result list in Gemini's ranked order
-            result = []
-            for item in ranked[:10]:
-                idx = item["index"]
-                if 0 <= idx < len(capped):
-                    article = capped[idx].copy()
-                    article["ai_summary"] = item["summary"]
-                    result.append(article)
+        logger.info(f"  Gemini selected top {len(result)} AI stories from {len(capped)} articles")
+        return result
 
-            logger.info(f"  Gemini selected top {len(result)} AI stories from {len(capped)} articles")
-            return result
+    result = _call_gemini(prompt, "top stories", parse)
+    if result is not None:
+        return result
 
-        except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"  Gemini top stories attempt {attempt + 1} failed: {e}")
-                time.sleep(5)
-            else:
-                logger.warning(f"  Gemini top stories failed after {max_retries} attempts: {e}")
+    if SUMMARY_ENGINE == "auto":
+        from local_summarizer import rank_top_stories_local
+        logger.info("  Local engine fallback for top stories")
+        return rank_top_stories_local(articles)
 
     # Fallback: return first 10 articles without summaries
     return capped[:10]
@@ -1,11 +1,11 @@
 """
 NovaPulse — Telegram Sender
-Sends messages to a Telegram channel via Bot API.
+Sends (and, for edit-in-place delivery, edits) messages in a Telegram
+channel via Bot API.
 """
 
 import time
 import logging
-import requests
 from config import (
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHANNEL_ID,
@@ -17,46 +17,138 @@ logger = logging.getLogger(__name__)
 
 TELEGRAM_API = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
 
+# editMessageText errors meaning the message can never be edited again
+_UNEDITABLE_ERRORS = ("message to edit not found", "message can't be edited", "message_id_invalid")
 
-def send_message(text: str) -> bool:
-    """Send a single HTML message to the configured channel."""
+
+def _call(method: str, payload: dict, bot_token: str | None = None) -> dict | None:
+    """POST one Bot API method. Returns the response body, or None on failure."""
+    bot_token = bot_token or TELEGRAM_BOT_TOKEN
+    if not bot_token or not payload.get("chat_id"):
+        logger.error("TELEGRAM_BOT_TOKEN or TELEGRAM_CHANNEL_ID not set!")
+        return None
+
+    import requests
+
+    try:
+        resp = requests.post(f"https://api.telegram.org/bot{bot_token}/{method}", json=payload, timeout=15)
+        return resp.json()
+    except Exception as e:
+        logger.error(f"Telegram {method} failed: {e}")
+        return None
+
+
+def post_message(text: str, chat_id: str | None = None, bot_token: str | None = None) -> int | None:
+    """
+    Send a single HTML message to the configured channel, or to `chat_id`
+    when replying to a user. `bot_token` overrides the configured bot
+    (multi-tenant runs). Returns the new message's id (0 on dry runs),
+    or None if it wasn't sent.
+    """
     if DRY_RUN:
         print("=" * 60)
         print(text)
         print("=" * 60)
-        return True
+        return 0
 
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHANNEL_ID:
-        logger.error("TELEGRAM_BOT_TOKEN or TELEGRAM_CHANNEL_ID not set!")
-        return False
+    payload = {
+        "chat_id": chat_id or TELEGRAM_CHANNEL_ID,
+        "text": text,
+        "parse_mode": "HTML",
+        "disable_web_page_preview": False,
+    }
+    data = _call("sendMessage", payload, bot_token)
+    if data is None:
+        return None
+    if not data.get("ok"):
+        logger.error(f"Telegram API error: {data.get('description')}")
+        return None
+    return data["result"]["message_id"]
+
+
+def send_message(text: str, chat_id: str | None = None, bot_token: str | None = None) -> bool:
+    """post_message for callers that only need to know whether it went out."""
+    return post_message(text, chat_id, bot_token) is not None
+
+
+def edit_message(
+    message_id: int,
+    text: str,
+    chat_id: str | None = None,
+    bot_token: str | None = None,
+) -> str:
+    """
+    Replace the text of a message the bot posted earlier (editMessageText).
+    Returns "ok" (edited, or Telegram's "message is not modified"),
+    "gone" (deleted, too old or otherwise uneditable for good) or "error"
+    (network trouble, rate limits, server errors — worth retrying later).
+    """
+    if DRY_RUN:
+        print("=" * 60 + f"\n[edit #{message_id}]")
+        print(text)
+        print("=" * 60)
+        return "ok"
 
     payload = {
-        "chat_id": TELEGRAM_CHANNEL_ID,
+        "chat_id": chat_id or TELEGRAM_CHANNEL_ID,
+        "message_id": message_id,
         "text": text,
         "parse_mode": "HTML",
         "disable_web_page_preview": False,
     }
-    try:
-        resp = requests.post(f"{TELEGRAM_API}/sendMessage", json=payload, timeout=15)
-        data = resp.json()
-        if not data.get("ok"):
-            logger.error(f"Telegram API error: {data.get('description')}")
-            return False
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send Telegram message: {e}")
-        return False
+    data = _call("editMessageText", payload, bot_token)
+    if data is None:
+        return "error"
+    if data.get("ok"):
+        return "ok"
+    description = data.get("description", "")
+    if "message is not modified" in description:
+        return "ok"
+    logger.error(f"Telegram API error: {description}")
+    if data.get("error_code") == 400 and any(e in description.lower() for e in _UNEDITABLE_ERRORS):
+        return "gone"
+    return "error"
 
 
-def send_messages(messages: list[str]) -> int:
+def send_messages(
+    messages: list[str],
+    chat_id: str | None = None,
+    bot_token: str | None = None,
+) -> int:
     """Send a list of messages with a delay. Returns count of successes."""
     sent = 0
     for i, msg in enumerate(messages):
         if not msg.strip():
             continue
-        success = send_message(msg)
+        success = send_message(msg, chat_id, bot_token)
         if success:
             sent += 1
         if i < len(messages) - 1:
             time.sleep(SEND_DELAY_SECONDS)
     return sent
+
+
+def get_updates(offset: int | None = None, timeout: int = 50) -> list[dict]:
+    """
+    Long-poll the Bot API for new updates. Blocks for up to `timeout`
+    seconds and returns [] on timeout or error.
+    """
+    if not TELEGRAM_BOT_TOKEN:
+        logger.error("TELEGRAM_BOT_TOKEN not set!")
+        return []
+
+    import requests
+
+    params = {"timeout": timeout, "allowed_updates": '["message"]'}
+    if offset is not None:
+        params["offset"] = offset
+    try:
+        resp = requests.get(f"{TELEGRAM_API}/getUpdates", params=params, timeout=timeout + 10)
+        data = resp.json()
+        if not data.get("ok"):
+            logger.error(f"Telegram API error: {data.get('description')}")
+            return []
+        return data.get("result", [])
+    except Exception as e:
+        logger.error(f"Failed to poll Telegram updates: {e}")
+        return []
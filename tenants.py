@@ -0,0 +1,306 @@
+"""
+NovaPulse — Multi-Tenant Runner
+Runs several branded channels from one process: every tenant's feeds are
+fetched once in a shared, deduplicated pass, then each tenant's
+classification, formatting and delivery run in parallel worker processes.
+Gemini results are shared through a cross-process summary cache, so two
+tenants asking for the same category over the same articles pay for one call.
+
+Usage:
+    python tenants.py                      # Reads TENANTS_FILE (tenants.json)
+    python tenants.py --config my.json
+    DRY_RUN=true python tenants.py         # Print every tenant's messages
+
+Each tenant in the JSON list (see tenants.example.json):
+    name                       unique id; also names its seen-URL file
+    channel_id                 Telegram channel (@name or -100…)
+    bot_token_env              env var holding its bot token (default TELEGRAM_BOT_TOKEN)
+    brand                      name shown in headers/footers (default BuzzWordAI)
+    mode                       "top" (Top 10, default) or "digest" (per category)
+    categories                 list of keys from categories.py, or a dict of full
+                               category definitions in the same shape
+    category_order             display order (default: categories.py order)
+    feeds                      RSS feeds (default: GLOBAL_RSS_FEEDS + its categories' feeds)
+    max_articles_per_category  default MAX_ARTICLES_PER_CATEGORY
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+
+from categories import CATEGORIES, CATEGORY_ORDER, GLOBAL_RSS_FEEDS
+from config import (
+    TENANTS_FILE,
+    TENANT_WORKERS,
+    TENANT_WATERMARK_FILE,
+    MAX_ARTICLES_PER_CATEGORY,
+    GEMINI_API_KEY,
+    SUMMARY_ENGINE,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+GEMINI_SPACING_SECONDS = 5  # Between uncached Gemini call starts, across all tenants
+LOCK_STRIPES = 64           # Per-key cache locks (keys hash onto these)
+
+
+# ─── Tenant Configs ──────────────────────────────────────────────────────────
+
+def load_tenants(path: str = TENANTS_FILE) -> list[dict]:
+    """Read and normalise tenant configs. Raises ValueError on bad configs."""
+    with open(path) as f:
+        raw = json.load(f)
+
+    tenants, names = [], set()
+    for t in raw:
+        name = t.get("name")
+        if not name or name in names:
+            raise ValueError(f"Tenant name missing or duplicated: {name!r}")
+        if not t.get("channel_id"):
+            raise ValueError(f"Tenant {name!r} has no channel_id")
+        names.add(name)
+
+        cats = t.get("categories", list(CATEGORIES))
+        if isinstance(cats, list):
+            unknown = [k for k in cats if k not in CATEGORIES]
+            if unknown:
+                raise ValueError(f"Tenant {name!r} uses unknown categories: {unknown}")
+            cats = {k: CATEGORIES[k] for k in cats}
+
+        order = t.get("category_order") or (
+            [k for k in CATEGORY_ORDER if k in cats] + [k for k in cats if k not in CATEGORY_ORDER]
+        )
+        feeds = t.get("feeds")
+        if feeds is None:
+            feeds = set(GLOBAL_RSS_FEEDS)
+            for cat in cats.values():
+                feeds.update(cat.get("rss_feeds", []))
+
+        tenants.append({
+            "name": name,
+            "channel_id": t["channel_id"],
+            "bot_token": os.getenv(t.get("bot_token_env", "TELEGRAM_BOT_TOKEN"), ""),
+            "brand": t.get("brand", "BuzzWordAI"),
+            "mode": t.get("mode", "top"),
+            "categories": cats,
+            "category_order": order,
+            "feeds": sorted(feeds),
+            "max_articles": t.get("max_articles_per_category", MAX_ARTICLES_PER_CATEGORY),
+            "seen_file": f"seen_urls.{name}.json",
+        })
+    return tenants
+
+
+# ─── Shared Summary Cache ────────────────────────────────────────────────────
+# Keys describe exactly what a prompt would contain, values only the URLs
+# and summaries, so any tenant with the same inputs can reuse the result.
+# Hits never lock. A miss locks only its key (one of LOCK_STRIPES manager
+# locks), so two tenants needing the same result compute it once while
+# every other key proceeds in parallel. Gemini spacing is a separate,
+# short-held lock around the "next call may start at" timestamp.
+
+def _shared_state(manager) -> dict:
+    return {
+        "cache": manager.dict(),
+        "locks": [manager.Lock() for _ in range(LOCK_STRIPES)],
+        "gemini_lock": manager.Lock(),
+        "next_gemini_call": manager.Value("d", 0.0),
+    }
+
+
+def _throttle_gemini(shared: dict) -> None:
+    """Wait for this process's turn to start a Gemini call (no-op for the local engine)."""
+    if not GEMINI_API_KEY or SUMMARY_ENGINE == "local":
+        return
+    with shared["gemini_lock"]:
+        wait = shared["next_gemini_call"].value - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        shared["next_gemini_call"].value = time.time() + GEMINI_SPACING_SECONDS
+
+
+def _cached_call(shared: dict, key: tuple, compute) -> object:
+    cache = shared["cache"]
+    if key in cache:
+        return cache[key]
+    lock = shared["locks"][zlib.crc32(repr(key).encode()) % LOCK_STRIPES]
+    with lock:
+        if key not in cache:  # Another tenant may have filled it while we waited
+            _throttle_gemini(shared)
+            cache[key] = compute()
+        return cache[key]
+
+
+def _summarize_category_shared(
+    shared: dict,
+    cat_key: str,
+    cat: dict,
+    articles: list[dict],
+    max_articles: int,
+) -> list[dict]:
+    from summarizer import summarize_category
+
+    capped = articles[:max_articles]
+    key = ("category", cat["title"], max_articles, tuple(a["url"] for a in capped))
+
+    def compute() -> dict[str, str]:
+        result = summarize_category(cat_key, [dict(a) for a in capped], cat["title"], max_articles)
+        return {a["url"]: a.get("ai_summary", "") for a in result}
+
+    kept = _cached_call(shared, key, compute)
+    out = []
+    for a in capped:
+        if a["url"] in kept:
+            article = dict(a)
+            if kept[a["url"]]:
+                article["ai_summary"] = kept[a["url"]]
+            out.append(article)
+    return out
+
+
+def _top_stories_shared(shared: dict, articles: list[dict]) -> list[dict]:
+    from summarizer import summarize_top_stories
+
+    key = ("top", tuple(a["url"] for a in articles))
+
+    def compute() -> list[tuple]:
+        return [
+            (a["url"], a.get("ai_summary", ""), a.get("cluster_size"))
+            for a in summarize_top_stories([dict(a) for a in articles])
+        ]
+
+    by_url = {a["url"]: a for a in articles}
+    out = []
+    for url, summary, cluster_size in _cached_call(shared, key, compute):
+        article = dict(by_url[url])
+        if summary:
+            article["ai_summary"] = summary
+        if cluster_size:
+            article["cluster_size"] = cluster_size
+        out.append(article)
+    return out
+
+
+# ─── Per-Tenant Pipeline ─────────────────────────────────────────────────────
+
+def run_tenant(tenant: dict, articles: list[dict], shared: dict) -> dict:
+    """
+    Dedup, classify, summarise, format and send for one tenant.
+    Runs in a worker process; returns a small report for the parent.
+    """
+    from posted import load_seen_urls, save_seen_urls, filter_seen
+    from classifier import classify_all
+    from formatter import format_full_digest, format_top_stories
+    from telegram_bot import send_messages
+
+    name = tenant["name"]
+    seen = load_seen_urls(tenant["seen_file"])
+    fresh = filter_seen(articles, seen)
+    logger.info(f"[{name}] {len(fresh)} fresh of {len(articles)} articles")
+    report = {"name": name, "fresh": len(fresh), "sent": 0, "messages": 0, "summarised": []}
+    if not fresh:
+        return report
+
+    if tenant["mode"] == "top":
+        summarised = _top_stories_shared(shared, fresh)
+        messages = format_top_stories(summarised, brand=tenant["brand"]) if summarised else []
+    else:
+        categorised = classify_all(fresh, tenant["categories"])
+        summarised_by_cat = {
+            key: _summarize_category_shared(shared, key, tenant["categories"][key], arts, tenant["max_articles"])
+            for key, arts in categorised.items()
+            if arts
+        }
+        summarised = [a for arts in summarised_by_cat.values() for a in arts]
+        messages = format_full_digest(
+            summarised_by_cat,
+            categories=tenant["categories"],
+            order=tenant["category_order"],
+            brand=tenant["brand"],
+            max_articles=tenant["max_articles"],
+        ) if summarised else []
+
+    if messages:
+        report["sent"] = send_messages(messages, tenant["channel_id"], tenant["bot_token"])
+        report["messages"] = len(messages)
+    report["summarised"] = summarised
+
+    seen.update(a["url"] for a in fresh)
+    save_seen_urls(seen, tenant["seen_file"])
+    logger.info(f"[{name}] sent {report['sent']}/{report['messages']} messages")
+    return report
+
+
+# ─── Main ────────────────────────────────────────────────────────────────────
+
+def _tenant_articles(tenant: dict, pool: list[dict], feeds_by_url: dict[str, set[str]]) -> list[dict]:
+    """
+    The tenant's share of the shared fetch: articles any of its feeds
+    listed (not just the feed that won the URL dedup), plus NewsAPI.
+    """
+    feeds = set(tenant["feeds"])
+    return [
+        a for a in pool
+        if feeds_by_url.get(a["url"], set()) & feeds or not a["source"].startswith("http")
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run NovaPulse for several channels")
+    parser.add_argument("--config", default=TENANTS_FILE)
+    args = parser.parse_args(argv)
+
+    from fetcher import fetch_all_articles, commit_watermarks
+    from relevance import prefilter
+
+    tenants = load_tenants(args.config)
+    all_feeds = sorted({f for t in tenants for f in t["feeds"]})
+    logger.info(f"⚡ NovaPulse multi-tenant run: {len(tenants)} tenants, {len(all_feeds)} unique feeds")
+
+    feeds_by_url: dict[str, set[str]] = {}
+    pool = prefilter(fetch_all_articles(
+        hours=12, incremental=True, feeds=all_feeds, watermark_file=TENANT_WATERMARK_FILE,
+        feeds_by_url=feeds_by_url,
+    ))
+    logger.info(f"Shared fetch: {len(pool)} candidate articles")
+
+    with Manager() as manager:
+        shared = _shared_state(manager)
+        workers = max(1, min(TENANT_WORKERS, len(tenants)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_tenant, t, _tenant_articles(t, pool, feeds_by_url), shared)
+                for t in tenants
+            ]
+            reports = []
+            for t, fut in zip(tenants, futures):
+                try:
+                    reports.append(fut.result())
+                except Exception as e:
+                    logger.error(f"[{t['name']}] tenant run failed: {e}")
+        logger.info(f"Summary cache: {len(shared['cache'])} entries shared across tenants")
+
+    from news_bot import archive_run
+    archive_run(pool, [a for r in reports for a in r["summarised"]])
+    if len(reports) == len(tenants):
+        commit_watermarks(TENANT_WATERMARK_FILE)
+    else:
+        logger.warning("Some tenants failed — keeping old watermarks so their articles are refetched.")
+
+    for r in reports:
+        logger.info(f"  {r['name']:<16} fresh {r['fresh']:>3}  sent {r['sent']}/{r['messages']}")
+    logger.info("✅ NovaPulse multi-tenant run complete.")
+
+
+if __name__ == "__main__":
+    main()